@@ -0,0 +1,98 @@
+'''Vectorized engine that plays many independent rounds at once.
+
+Every round is dealt from its own shuffled deck (one row of a 2D array of
+card codes), in the same order Simulator deals: dealer, player, dealer,
+player, then player hits, then dealer draws. The player follows a strategy
+table in the format of simulator.stand_table.
+'''
+from collections import namedtuple
+
+import numpy as np
+
+from classes import CARDS
+from simulator import (
+    LOSS, WIN, BLACKJACK, BUST, DEALER_BUST, DEALER_BLACKJACK)
+
+# hard point value of each card code
+POINTS = np.array([card.points for card in CARDS], dtype = np.int16)
+
+BatchResult = namedtuple(
+    "BatchResult", ["outcome", "payout", "player_value", "dealer_value"])
+
+
+def shuffled_decks(rounds, rng = None, num_decks = 1):
+    '''Array of shape (rounds, 52 * num_decks), one shuffled deck per row'''
+    rng = np.random.default_rng(rng)
+    deck = np.tile(np.arange(52, dtype = np.int8), num_decks)
+    decks = np.broadcast_to(deck, (rounds, deck.size)).copy()
+    return rng.permuted(decks, axis = 1, out = decks)
+
+
+def _value(hard, aces):
+    return hard + 10 * ((aces > 0) & (hard <= 11))
+
+
+def play_batch(decks, table, blackjack_payout = 1.5):
+    '''Play one round per row of decks and return a BatchResult of arrays'''
+    points = POINTS[np.asarray(decks)]
+    hit = np.asarray(table) == 'h'
+    rounds = points.shape[0]
+    rows = np.arange(rounds)
+
+    dealer_hard = points[:, 0] + points[:, 2]
+    dealer_aces = (points[:, 0] == 1).astype(np.int16) + (points[:, 2] == 1)
+    player_hard = points[:, 1] + points[:, 3]
+    player_aces = (points[:, 1] == 1).astype(np.int16) + (points[:, 3] == 1)
+    upcard = points[:, 2]
+    position = np.full(rounds, 4)
+
+    dealer_blackjack = _value(dealer_hard, dealer_aces) == 21
+    player_blackjack = ~dealer_blackjack & (_value(player_hard, player_aces) == 21)
+
+    # player turn
+    active = ~(dealer_blackjack | player_blackjack)
+    while True:
+        idx = rows[active]
+        if not idx.size:
+            break
+        hard = player_hard[idx]
+        aces = player_aces[idx]
+        value = _value(hard, aces)
+        soft = (aces > 0) & (hard <= 11)
+        idx = idx[hit[soft.astype(np.intp), value, upcard[idx]]]
+        card = points[idx, position[idx]]
+        position[idx] += 1
+        player_hard[idx] += card
+        player_aces[idx] += card == 1
+        active[:] = False
+        active[idx] = player_hard[idx] <= 21
+
+    player_value = _value(player_hard, player_aces)
+    player_bust = player_value > 21
+
+    # dealer turn
+    drawing = ~(dealer_blackjack | player_blackjack | player_bust)
+    while True:
+        drawing &= _value(dealer_hard, dealer_aces) <= 16
+        idx = rows[drawing]
+        if not idx.size:
+            break
+        card = points[idx, position[idx]]
+        position[idx] += 1
+        dealer_hard[idx] += card
+        dealer_aces[idx] += card == 1
+
+    dealer_value = _value(dealer_hard, dealer_aces)
+
+    outcome = np.where(dealer_value >= player_value, LOSS, WIN)
+    outcome[dealer_value > 21] = DEALER_BUST
+    outcome[player_bust] = BUST
+    outcome[player_blackjack] = BLACKJACK
+    outcome[dealer_blackjack] = DEALER_BLACKJACK
+    outcome = outcome.astype(np.int8)
+
+    payout = np.full(rounds, -1.0)
+    payout[(outcome == WIN) | (outcome == DEALER_BUST)] = 1.0
+    payout[outcome == BLACKJACK] = blackjack_payout
+
+    return BatchResult(outcome, payout, player_value, dealer_value)
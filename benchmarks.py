@@ -0,0 +1,195 @@
+'''Timing and memory benchmarks for the hot paths.
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.1
+
+Each benchmark reports the best time per operation over several repeats
+and the peak memory allocated by one batch of operations. With --compare
+any benchmark slower than the baseline by more than threshold is flagged
+and the exit status is 1.
+'''
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+
+from classes import CARDS, Card, Deck, Hand, Shoe
+from simulator import Simulator, stand_on
+
+
+def _hand(ranks):
+    hand = Hand(is_dealer = False)
+    for rank in ranks:
+        hand.add_card(Card(rank, 'S'))
+    return hand
+
+
+def bench_card_construction():
+    return lambda: Card('10', 'S')
+
+
+def bench_deck_fill():
+    deck = Deck()
+    return deck.fill_deck
+
+
+def bench_deck_shuffle():
+    deck = Deck()
+    return deck.shuffle
+
+
+def bench_deck_deal():
+    '''Refill a deck and deal all 52 cards'''
+    deck = Deck()
+    deal = deck.deal
+
+    def run():
+        deck.cards = list(CARDS)
+        for _ in range(52):
+            deal()
+    return run
+
+
+def bench_shoe_deal():
+    '''Deal 52 cards from a 6 deck shoe, rewinding the cursor first so
+    no reshuffle is ever timed'''
+    shoe = Shoe(num_decks = 6, penetration = 1)
+    deal = shoe.deal
+
+    def run():
+        shoe.position = 0
+        for _ in range(52):
+            deal()
+    return run
+
+
+def bench_shoe_shuffle():
+    shoe = Shoe(num_decks = 6)
+    return shoe.shuffle
+
+
+def bench_hand_value_typical():
+    hand = _hand(['10', '7'])
+    return lambda: hand.value
+
+
+def bench_hand_value_aces():
+    hand = _hand(['A', 'A', '5', 'A', 'K'])
+    return lambda: hand.value
+
+
+def bench_hand_build_and_value():
+    '''Build a hand card by card and evaluate it after every card'''
+    hand = Hand(is_dealer = False)
+    cards = [Card(rank, 'H') for rank in ['A', '4', 'A', '6']]
+
+    def run():
+        hand.clear()
+        for card in cards:
+            hand.add_card(card)
+            hand.value
+    return run
+
+
+def bench_round():
+    sim = Simulator(stand_on(17), seed = 0, num_decks = 6)
+    return sim.play_round
+
+
+# name: (setup, operations per timing loop)
+BENCHMARKS = {
+    "card_construction": (bench_card_construction, 100000),
+    "deck_fill": (bench_deck_fill, 10000),
+    "deck_shuffle": (bench_deck_shuffle, 5000),
+    "deck_deal_52": (bench_deck_deal, 5000),
+    "shoe_deal_52": (bench_shoe_deal, 5000),
+    "shoe_shuffle": (bench_shoe_shuffle, 500),
+    "hand_value_typical": (bench_hand_value_typical, 200000),
+    "hand_value_aces": (bench_hand_value_aces, 200000),
+    "hand_build_and_value": (bench_hand_build_and_value, 50000),
+    "round": (bench_round, 20000),
+}
+
+
+def measure(setup, number, repeat = 5):
+    '''Best seconds per operation and peak bytes allocated for one batch'''
+    op = setup()
+    seconds = min(timeit.repeat(op, number = number, repeat = repeat)) / number
+
+    op = setup()
+    tracemalloc.start()
+    for _ in range(min(number, 1000)):
+        op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ns_per_op": seconds * 1e9, "ops_per_second": 1 / seconds,
+            "peak_bytes": peak}
+
+
+def run(names = None, repeat = 5):
+    results = {}
+    for name in names or BENCHMARKS:
+        setup, number = BENCHMARKS[name]
+        results[name] = measure(setup, number, repeat)
+    return results
+
+
+def compare(results, baseline, threshold = 0.1):
+    '''Names of benchmarks more than threshold slower than baseline'''
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if result["ns_per_op"] > baseline[name]["ns_per_op"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "benchmarks", description = "Benchmark the hot paths.")
+    parser.add_argument("names", nargs = "*", help = "benchmarks to run")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--save", help = "write results as a baseline")
+    parser.add_argument("--compare", help = "baseline to check against")
+    parser.add_argument("--threshold", type = float, default = 0.1,
+                        help = "allowed slowdown, 0.1 = 10%%")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks {sorted(unknown)}")
+
+    results = run(args.names, args.repeat)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'benchmark':<22}{'ns/op':>12}{'ops/s':>14}{'peak KiB':>10}{'vs base':>10}")
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            ratio = result["ns_per_op"] / baseline[name]["ns_per_op"] - 1
+            change = f"{ratio:+.1%}"
+        print(f"{name:<22}{result['ns_per_op']:>12.1f}"
+              f"{result['ops_per_second']:>14,.0f}"
+              f"{result['peak_bytes'] / 1024:>10.1f}{change:>10}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(),
+                       "results": results}, f, indent = 2)
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,45 @@ import sys
 import time
 import os
 
+# ranks in deck order; '1' is accepted by Card for backwards compatibility
+# but is not part of a standard deck
+RANKS = ('A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', '1')
+SUITS = ('C', 'D', 'S', 'H')
+
+# hard point value of each rank, aces count 1 here and Hand adds the 10
+RANK_POINTS = {
+    'A': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7,
+    '8': 8, '9': 9, '10': 10, 'J': 10, 'Q': 10, 'K': 10, '1': 1}
+
+_RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+
 class Card:
-    # card class
+    # card class; code is a compact integer id, rank_index * 4 + suit_index,
+    # so the 52 standard cards are 0-51 in the order fill_deck builds them
+    __slots__ = ('rank', 'suit', 'code', 'points', 'is_ace')
+
     def __init__(self, rank, suit):
 
-        if rank not in [
-            '1', '2', '3', '4', '5', '6',
-            '7', '8', '9', '10', 'A', 'J', 'Q', 'K']:
-                raise ValueError("Invalid rank")
+        rank_index = _RANK_INDEX.get(rank)
+        if rank_index is None:
+            raise ValueError("Invalid rank")
 
-        valid_suits = ['D', 'S', 'C', 'H']
-        if suit not in valid_suits:
-            raise ValueError(f"Invalid suit. Valid suits are {valid_suits}")
+        suit_index = _SUIT_INDEX.get(suit)
+        if suit_index is None:
+            raise ValueError(f"Invalid suit. Valid suits are {list(SUITS)}")
 
         self.suit = suit
         self.rank = rank
+        self.code = rank_index * 4 + suit_index
+        self.points = RANK_POINTS[rank]
+        self.is_ace = rank == 'A'
+
+    @classmethod
+    def from_code(cls, code):
+        '''Return the shared Card instance for an integer card code'''
+        return CARDS[code]
 
     # unicode value to print suit symbols
     suit_lu = {
@@ -27,6 +51,14 @@ class Card:
         "S": "\u2660"
     }    
     
+    def __eq__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.code == other.code
+
+    def __hash__(self):
+        return self.code
+
     def __repr__(self):
         rep = f"Card('{self.rank}', '{self.suit}')"
         return rep
@@ -34,23 +66,29 @@ class Card:
     def __str__(self):
         string = "".join((str(self.rank), self.suit_lu[self.suit]))
         return string
-       
+
+
+# one shared instance of every card in a standard deck, indexed by code
+CARDS = tuple(Card(r, s) for r in RANKS[:13] for s in SUITS)
+
 class Deck():
-    def __init__(self):
+    def __init__(self, rng = None):
+        # rng is any object with a shuffle method, e.g. random.Random(seed);
+        # None uses the global random module, which is looked up at shuffle
+        # time rather than stored so decks stay picklable
+        self.rng = rng
         self.cards = []
         self.fill_deck()
         self.shuffle()
 
     def fill_deck(self):
-        suits = ["C", "D", "S", "H"]    
-        ranks = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
-        self.cards = [Card(r, s) for r in ranks for s in suits]
+        self.cards = list(CARDS)
         
     def clear_deck(self):
         self.cards = []
 
     def shuffle(self):
-        return random.shuffle(self.cards)
+        return (self.rng or random).shuffle(self.cards)
 
     def deal(self):
         return self.cards.pop(0)
@@ -64,6 +102,187 @@ class Deck():
         return f'Deck({self.cards})'
 
 
+class Shoe(Deck):
+    '''One or more decks dealt by advancing a cursor.
+
+    The shoe is only reshuffled once the cut card is reached, i.e. once
+    penetration (0-1) of the cards have been dealt. Check needs_shuffle
+    between rounds. A penetration of 0 reshuffles before every round.
+    The same card list is shuffled in place every time.
+
+    rank_counts[points] is the number of undealt cards worth points (1 for
+    aces), and with a counting.CountSystem the running count follows every
+    card dealt. Both are updated in O(1) per card.
+    '''
+
+    def __init__(self, num_decks = 1, penetration = 0.75, rng = None,
+                 count_system = None):
+        if num_decks not in range(1, 9):
+            raise ValueError("Number of decks must be between 1 and 8")
+        if not 0 <= penetration <= 1:
+            raise ValueError("Penetration must be between 0 and 1")
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.count_system = count_system
+        self._tags = count_system.tags if count_system else (0,) * 11
+        self.position = 0
+        self.shuffles = 0
+        super().__init__(rng = rng)
+
+    def fill_deck(self):
+        self.cards = list(CARDS) * self.num_decks
+        self.cut = int(len(self.cards) * self.penetration)
+        self._full_counts = [0] + [4 * self.num_decks] * 9 + [16 * self.num_decks]
+        self.rank_counts = list(self._full_counts)
+        self._reset_count()
+
+    def _reset_count(self):
+        self.position = 0
+        self.rank_counts[:] = self._full_counts
+        if self.count_system:
+            self.running_count = self.count_system.initial_count(self.num_decks)
+        else:
+            self.running_count = 0
+
+    def shuffle(self):
+        (self.rng or random).shuffle(self.cards)
+        self._reset_count()
+        self.shuffles += 1
+
+    @property
+    def needs_shuffle(self):
+        return self.position >= self.cut
+
+    @property
+    def remaining(self):
+        return len(self.cards) - self.position
+
+    @property
+    def decks_remaining(self):
+        return self.remaining / 52
+
+    @property
+    def true_count(self):
+        '''Running count per deck left in the shoe'''
+        if not self.remaining:
+            return float(self.running_count)
+        return self.running_count * 52 / self.remaining
+
+    @property
+    def composition(self):
+        '''Undealt card counts for point values 1-10'''
+        return self.rank_counts[1:]
+
+    def get_state(self):
+        '''Card order, cursor and counts, for checkpointing'''
+        return {
+            "num_decks": self.num_decks,
+            "cards": bytes(card.code for card in self.cards),
+            "position": self.position,
+            "rank_counts": list(self.rank_counts),
+            "running_count": self.running_count,
+            "shuffles": self.shuffles,
+        }
+
+    def set_state(self, state):
+        if state["num_decks"] != self.num_decks:
+            raise ValueError(
+                f"State is for a {state['num_decks']} deck shoe, "
+                f"not {self.num_decks}")
+        self.cards[:] = [CARDS[code] for code in state["cards"]]
+        self.position = state["position"]
+        self.rank_counts[:] = state["rank_counts"]
+        self.running_count = state["running_count"]
+        self.shuffles = state["shuffles"]
+
+    def deal(self):
+        position = self.position
+        # only reachable mid-round with a very deep cut; start over rather
+        # than run out of cards
+        if position >= len(self.cards):
+            self.shuffle()
+            position = 0
+        self.position = position + 1
+        card = self.cards[position]
+        self.rank_counts[card.points] -= 1
+        self.running_count += self._tags[card.points]
+        return card
+
+    def __len__(self):
+        return self.remaining
+
+    def __str__(self):
+        num_remaining = f"Cards Remaining: {self.remaining}"
+        next_card = f"Next Card: {str(self.cards[self.position])}" \
+            if self.remaining else "Next Card: None"
+        return num_remaining + '\n' + next_card
+
+    def __repr__(self):
+        return f'Shoe({self.num_decks}, {self.penetration})'
+
+
+class _HandCards(list):
+    '''A Hand's list of cards; any change made to it directly marks the
+    hand's cached totals stale'''
+    __slots__ = ('_hand',)
+
+    def __init__(self, hand, cards = ()):
+        super().__init__(cards)
+        self._hand = hand
+
+    def __reduce__(self):
+        # pickles as a plain list, which Hand.__setstate__ wraps again
+        return list, (list(self),)
+
+    def append(self, card):
+        self._hand._counted = -1
+        super().append(card)
+
+    def extend(self, cards):
+        self._hand._counted = -1
+        super().extend(cards)
+
+    def insert(self, index, card):
+        self._hand._counted = -1
+        super().insert(index, card)
+
+    def pop(self, index = -1):
+        self._hand._counted = -1
+        return super().pop(index)
+
+    def remove(self, card):
+        self._hand._counted = -1
+        super().remove(card)
+
+    def clear(self):
+        self._hand._counted = -1
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._hand._counted = -1
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._hand._counted = -1
+        super().reverse()
+
+    def __setitem__(self, index, value):
+        self._hand._counted = -1
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._hand._counted = -1
+        super().__delitem__(index)
+
+    def __iadd__(self, cards):
+        self._hand._counted = -1
+        return super().__iadd__(cards)
+
+    def __imul__(self, n):
+        self._hand._counted = -1
+        return super().__imul__(n)
+
+
 class Hand:
 
     def __init__(self, is_dealer, is_active = False):
@@ -71,45 +290,73 @@ class Hand:
         self.is_dealer = is_dealer
         self.is_active = is_active
 
+    # the hard total (aces as 1) and ace count are kept up to date as cards
+    # are added, so value is O(1). Changing hand.cards directly (append,
+    # pop, item assignment, ...) makes the next evaluation recount.
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards):
+        self._cards = _HandCards(self, cards)
+        self._hard = 0
+        self._aces = 0
+        self._counted = -1
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cards'] = list(self._cards)
+        return state
+
+    def __setstate__(self, state):
+        cards = state.pop('_cards')
+        self.__dict__.update(state)
+        self.cards = cards
+
     def add_card(self, card):
-        self.cards.append(card)
+        cards = self._cards
+        list.append(cards, card)
+        if self._counted == len(cards) - 1:
+            self._hard += card.points
+            self._aces += card.is_ace
+            self._counted += 1
 
     def clear(self):
-        self.cards = []
+        list.clear(self._cards)
+        self._hard = 0
+        self._aces = 0
+        self._counted = 0
+
+    def _recount(self):
+        self._hard = sum(card.points for card in self._cards)
+        self._aces = sum(card.is_ace for card in self._cards)
+        self._counted = len(self._cards)
 
     @property
     def has_blackjack(self):
-        blackjack = False
-        if len(self.cards) == 2 and self.value == 21:
-            blackjack = True
-        return(blackjack)
+        return len(self._cards) == 2 and self.value == 21
 
     @property
     def is_bust(self):
-        bust = False
-        if self.value > 21:
-            bust = True
-        return(bust)
+        return self.value > 21
+
+    @property
+    def is_soft(self):
+        '''True if an ace is currently counted as 11'''
+        if self._counted != len(self._cards):
+            self._recount()
+        return self._aces > 0 and self._hard <= 11
 
     @property
     def value(self):
         '''Calculate the value of the cards in a hand instance'''
-        val = 0
-        num_aces = 0
-
-        for card in self.cards:
-            if card.rank.isnumeric():
-                val += int(card.rank)
-            elif card.rank == "A":
-                num_aces += 1
-                val += 11
-            else:
-                val += 10
-        while num_aces > 0 and val > 21:
-            val -= 10
-            num_aces -= 1
-
-        return val
+        if self._counted != len(self._cards):
+            self._recount()
+        # at most one ace can count as 11 without busting
+        if self._aces and self._hard <= 11:
+            return self._hard + 10
+        return self._hard
 
     def show(self, dealer_hide = False):
         
@@ -148,8 +395,8 @@ class Hand:
 
 class Game:
     
-    def __init__(self):
-        self.deck = Deck()
+    def __init__(self, num_decks = 1, penetration = 0.75):
+        self.deck = Shoe(num_decks, penetration)
         self.player = Hand(is_dealer = False, is_active = None)
         self.dealer = Hand(is_dealer = True)
         self.game_active = True
@@ -175,10 +422,10 @@ class Game:
             
             clear_console()
 
-            # clear hands, shuffle and set player turn each time we play
-            self.deck.clear_deck()
-            self.deck.fill_deck()
-            self.deck.shuffle()
+            # clear hands, shuffle at the cut card and set player turn
+            # each time we play
+            if self.deck.needs_shuffle:
+                self.deck.shuffle()
             self.player.clear()
             self.dealer.clear()
             self.player.is_active = True
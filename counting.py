@@ -0,0 +1,77 @@
+'''Card counting systems and bet sizing for Shoe.
+
+A CountSystem gives a tag to each card point value (1 for an ace, 10 for
+any ten-valued card). A Shoe created with a count system adds the tag of
+every card it deals to its running count.
+'''
+
+
+class CountSystem:
+    '''Tags by point value plus the initial running count.
+
+    Unbalanced systems such as KO start the running count at
+    initial_offset + initial_per_deck * num_decks instead of 0.
+    '''
+
+    def __init__(self, name, tags, initial_per_deck = 0, initial_offset = 0):
+        if sorted(tags) != list(range(1, 11)):
+            raise ValueError("Tags must cover point values 1-10")
+        self.name = name
+        # indexed by card points, index 0 is unused
+        self.tags = (0,) + tuple(tags[points] for points in range(1, 11))
+        self.initial_per_deck = initial_per_deck
+        self.initial_offset = initial_offset
+
+    @property
+    def is_balanced(self):
+        return self.initial_per_deck == 0 and self.initial_offset == 0
+
+    def initial_count(self, num_decks):
+        return self.initial_offset + self.initial_per_deck * num_decks
+
+    def __repr__(self):
+        return f"CountSystem({self.name!r})"
+
+
+HI_LO = CountSystem("hilo", {
+    1: -1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 0, 8: 0, 9: 0, 10: -1})
+
+KO = CountSystem("ko", {
+    1: -1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 1, 8: 0, 9: 0, 10: -1},
+    initial_per_deck = -4, initial_offset = 4)
+
+HI_OPT_I = CountSystem("hiopt1", {
+    1: 0, 2: 0, 3: 1, 4: 1, 5: 1, 6: 1, 7: 0, 8: 0, 9: 0, 10: -1})
+
+OMEGA_II = CountSystem("omega2", {
+    1: 0, 2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 1, 8: 0, 9: -1, 10: -2})
+
+ZEN = CountSystem("zen", {
+    1: -1, 2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 1, 8: 0, 9: 0, 10: -2})
+
+COUNT_SYSTEMS = {
+    system.name: system for system in (HI_LO, KO, HI_OPT_I, OMEGA_II, ZEN)}
+
+
+def flat_bet(shoe):
+    return 1.0
+
+
+def bet_ramp(ramp, min_bet = 1.0, use_true_count = True):
+    '''Bet sizer mapping a count to a bet.
+
+    ramp maps a count threshold to the bet placed at or above it, e.g.
+    {2: 2, 3: 4, 4: 8}. Below the lowest threshold min_bet is placed. The
+    true count is floored before the lookup; use_true_count=False uses the
+    running count instead, as unbalanced systems like KO do.
+    '''
+    steps = sorted(ramp.items(), reverse = True)
+
+    def bet_sizer(shoe):
+        count = shoe.true_count if use_true_count else shoe.running_count
+        count = int(count // 1)
+        for threshold, bet in steps:
+            if count >= threshold:
+                return bet
+        return min_bet
+    return bet_sizer
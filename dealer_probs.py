@@ -0,0 +1,112 @@
+'''Exact distribution of the dealer's final hand.
+
+A shoe composition is a sequence of 10 card counts indexed by point value
+minus one: aces first, then 2-9, then all ten-valued cards together. The
+dealer follows the Game rules: draw while the hand is worth 16 or less,
+with an ace counting 11 when that does not bust the hand (so the dealer
+stands on soft 17).
+'''
+from functools import lru_cache
+
+# results of dealer_probabilities, in order
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, "bust", "blackjack")
+_BUST = 5
+_BLACKJACK = 6
+
+# bits per rank in an encoded composition; holds up to 511 of a rank,
+# enough for the 128 ten-valued cards in 8 decks
+COUNT_BITS = 9
+_COUNT_MASK = (1 << COUNT_BITS) - 1
+
+CACHE_SIZE = 2 ** 18
+
+
+def full_composition(num_decks = 1):
+    return [4 * num_decks] * 9 + [16 * num_decks]
+
+
+def composition_from_cards(cards):
+    '''Composition of a collection of Card objects'''
+    counts = [0] * 10
+    for card in cards:
+        counts[card.points - 1] += 1
+    return counts
+
+
+def encode_composition(counts):
+    '''Pack a composition into a single int, COUNT_BITS per rank'''
+    packed = 0
+    for i, n in enumerate(counts):
+        if not 0 <= n <= _COUNT_MASK:
+            raise ValueError(f"Invalid count {n} for rank {i + 1}")
+        packed |= n << (COUNT_BITS * i)
+    return packed
+
+
+class DealerCalculator:
+    '''Memoized exact dealer outcome probabilities.
+
+    Results are cached on (dealer hand, encoded composition) in an LRU
+    cache holding at most cache_size entries.
+    '''
+
+    def __init__(self, cache_size = CACHE_SIZE):
+        self._outcomes = lru_cache(maxsize = cache_size)(self._outcomes)
+
+    def probabilities(self, upcard, composition):
+        '''Probability of each DEALER_OUTCOMES result.
+
+        upcard is a Card or its point value; composition is what is left in
+        the shoe with the upcard already removed. Returns a dict keyed by
+        DEALER_OUTCOMES.
+        '''
+        points = getattr(upcard, "points", upcard)
+        if points not in range(1, 11):
+            raise ValueError("Upcard must be worth 1-10 points")
+        packed = encode_composition(composition)
+        dist = self._outcomes(points, points == 1, packed, sum(composition), True)
+        return dict(zip(DEALER_OUTCOMES, dist))
+
+    def cache_info(self):
+        return self._outcomes.cache_info()
+
+    def cache_clear(self):
+        self._outcomes.cache_clear()
+
+    def _outcomes(self, hard, has_ace, packed, total, hole):
+        # hole is True while the dealer still has only the upcard
+        if total == 0:
+            raise ValueError("Composition ran out of cards")
+
+        dist = [0.0] * 7
+        outcomes = self._outcomes
+        for i in range(10):
+            n = (packed >> (COUNT_BITS * i)) & _COUNT_MASK
+            if not n:
+                continue
+            p = n / total
+            new_hard = hard + i + 1
+            new_ace = has_ace or i == 0
+            value = new_hard + 10 if new_ace and new_hard <= 11 else new_hard
+
+            if hole and value == 21:
+                dist[_BLACKJACK] += p
+            elif value > 21:
+                dist[_BUST] += p
+            elif value >= 17:
+                dist[value - 17] += p
+            else:
+                sub = outcomes(
+                    new_hard, new_ace, packed - (1 << (COUNT_BITS * i)),
+                    total - 1, False)
+                for j in range(7):
+                    dist[j] += p * sub[j]
+        return tuple(dist)
+
+
+_default = DealerCalculator()
+
+
+def dealer_probabilities(upcard, composition):
+    '''Exact dealer outcome probabilities using a shared cache'''
+    return _default.probabilities(upcard, composition)
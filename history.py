@@ -0,0 +1,163 @@
+'''Append-only binary hand history.
+
+A history file is a 16 byte header followed by fixed-width 40 byte
+records, one per round, little-endian:
+
+    payout        float32   amount won or lost
+    bet           float32
+    actions       uint16    bit i set if the player hit on decision i
+    player_cards  12 x uint8 card codes (see Card.code), 255 = no card
+    dealer_cards  12 x uint8
+    n_player      uint8     cards the player held (only 12 are stored)
+    n_dealer      uint8
+    n_actions     uint8     decisions the player made
+    player_total  uint8
+    dealer_total  uint8
+    outcome       uint8     see simulator.OUTCOME_NAMES
+
+HistoryWriter only needs the standard library. HistoryReader memory-maps
+the file with NumPy, so columns are views into the file and nothing is
+loaded into Python objects.
+'''
+import os
+import struct
+
+from simulator import BUST, BLACKJACK, DEALER_BLACKJACK
+
+MAGIC = b"BJHH"
+VERSION = 1
+MAX_CARDS = 12
+NO_CARD = 255
+
+_HEADER = struct.Struct("<4sHH8x")
+_RECORD = struct.Struct(f"<ffH{MAX_CARDS}s{MAX_CARDS}sBBBBBB")
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+
+FIELDS = [
+    ("payout", "<f4"),
+    ("bet", "<f4"),
+    ("actions", "<u2"),
+    ("player_cards", "u1", (MAX_CARDS,)),
+    ("dealer_cards", "u1", (MAX_CARDS,)),
+    ("n_player", "u1"),
+    ("n_dealer", "u1"),
+    ("n_actions", "u1"),
+    ("player_total", "u1"),
+    ("dealer_total", "u1"),
+    ("outcome", "u1"),
+]
+
+
+def _codes(cards):
+    return bytes(card.code for card in cards[:MAX_CARDS]).ljust(
+        MAX_CARDS, bytes((NO_CARD,)))
+
+
+class HistoryWriter:
+    '''Buffers records and appends them to path buffer_records at a time'''
+
+    def __init__(self, path, buffer_records = 8192):
+        self.path = path
+        self.buffer_records = buffer_records
+        self._buffer = bytearray(RECORD_SIZE * buffer_records)
+        self._pending = 0
+        self.written = 0
+        self._file = open(path, "ab")
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+            return
+        try:
+            _check_header(path)
+        except ValueError:
+            self._file.close()
+            raise
+        # drop a record torn by an earlier run that died mid-write, so new
+        # records stay aligned
+        whole = size - (size - HEADER_SIZE) % RECORD_SIZE
+        if whole != size:
+            self._file.truncate(whole)
+
+    def record(self, player, dealer, outcome, payout, bet = 1.0):
+        '''Add a finished round, given the final player and dealer hands'''
+        n_player = len(player.cards)
+        # the player hits, then stands unless they bust; nobody acts when
+        # either side has blackjack
+        if outcome == BLACKJACK or outcome == DEALER_BLACKJACK:
+            hits = n_actions = 0
+        else:
+            hits = n_player - 2
+            n_actions = hits if outcome == BUST else hits + 1
+        _RECORD.pack_into(
+            self._buffer, self._pending * RECORD_SIZE,
+            payout, bet, (1 << hits) - 1,
+            _codes(player.cards), _codes(dealer.cards),
+            n_player, len(dealer.cards), n_actions,
+            player.value, dealer.value, outcome)
+        self._pending += 1
+        if self._pending == self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write(
+                memoryview(self._buffer)[:self._pending * RECORD_SIZE])
+            self.written += self._pending
+            self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _check_header(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} is not a hand history file")
+    magic, version, record_size = _HEADER.unpack(header)
+    if magic != MAGIC or record_size != RECORD_SIZE:
+        raise ValueError(f"{path} is not a hand history file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported hand history version {version}")
+
+
+class HistoryReader:
+    '''Memory-mapped view of a history file.
+
+    reader["payout"] and the other FIELDS names return NumPy views of that
+    column straight from the file. A partly written last record is ignored.
+    '''
+
+    def __init__(self, path):
+        import numpy as np
+
+        _check_header(path)
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_SIZE
+        self.path = path
+        self.dtype = np.dtype(FIELDS)
+        if count:
+            self.records = np.memmap(
+                path, dtype = self.dtype, mode = "r", offset = HEADER_SIZE,
+                shape = (count,))
+        else:
+            self.records = np.empty(0, dtype = self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, name):
+        return self.records[name]
+
+    @property
+    def columns(self):
+        return self.dtype.names
@@ -0,0 +1,125 @@
+'''Per-phase timers and event counters for Simulator.
+
+    metrics = Metrics()
+    Simulator(policy, metrics = metrics).run(100000)
+    metrics.write_json("metrics.json")
+    metrics.write_prometheus("blackjack.prom")
+
+Rounds are split into the phases of Game.play: dealing, blackjack checks,
+the player's turn, dealer draws and settlement. Simulator only reads the
+clock when it has a Metrics, so leaving it out costs a few None checks
+per round.
+
+Hand.value evaluations are counted by the simulator's own two hands,
+which it gets from Metrics.hand; other Hand instances are not affected.
+'''
+import json
+import os
+
+from classes import Hand
+from simulator import OUTCOME_NAMES
+
+PHASES = ("deal", "blackjack_check", "player", "dealer", "settle")
+
+
+class Metrics:
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.phase_ns = dict.fromkeys(PHASES, 0)
+        self.rounds = 0
+        self.cards_dealt = 0
+        self.hand_values = 0
+        self.reshuffles = 0
+        self.outcomes = [0] * len(OUTCOME_NAMES)
+
+    def add_round(self, t_start, t_dealt, t_checked, t_played, t_drawn,
+                  t_end, outcome, cards, shuffled):
+        '''Record one round from the clock readings at each phase boundary'''
+        phase_ns = self.phase_ns
+        phase_ns["deal"] += t_dealt - t_start
+        phase_ns["blackjack_check"] += t_checked - t_dealt
+        phase_ns["player"] += t_played - t_checked
+        phase_ns["dealer"] += t_drawn - t_played
+        phase_ns["settle"] += t_end - t_drawn
+        self.rounds += 1
+        self.cards_dealt += cards
+        self.reshuffles += shuffled
+        self.outcomes[outcome] += 1
+
+    def hand(self, is_dealer):
+        '''A Hand whose value evaluations are counted in these metrics'''
+        return CountingHand(is_dealer, self)
+
+    def snapshot(self):
+        total_ns = sum(self.phase_ns.values())
+        return {
+            "rounds": self.rounds,
+            "cards_dealt": self.cards_dealt,
+            "hand_values": self.hand_values,
+            "reshuffles": self.reshuffles,
+            "outcomes": {
+                OUTCOME_NAMES[i]: n for i, n in enumerate(self.outcomes)},
+            "phases": {
+                phase: {
+                    "seconds": ns / 1e9,
+                    "ns_per_round": ns / self.rounds if self.rounds else 0.0,
+                    "share": ns / total_ns if total_ns else 0.0,
+                }
+                for phase, ns in self.phase_ns.items()},
+        }
+
+    def to_prometheus(self, prefix = "blackjack"):
+        '''Snapshot in the Prometheus text exposition format'''
+        lines = [
+            f"# HELP {prefix}_phase_seconds_total Time spent in each round phase.",
+            f"# TYPE {prefix}_phase_seconds_total counter",
+        ]
+        for phase, ns in self.phase_ns.items():
+            lines.append(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {ns / 1e9!r}')
+        lines += [
+            f"# HELP {prefix}_rounds_total Rounds played by outcome.",
+            f"# TYPE {prefix}_rounds_total counter",
+        ]
+        for i, n in enumerate(self.outcomes):
+            lines.append(f'{prefix}_rounds_total{{outcome="{OUTCOME_NAMES[i]}"}} {n}')
+        for name, value, text in (
+                ("cards_dealt", self.cards_dealt, "Cards dealt."),
+                ("hand_values", self.hand_values, "Hand.value evaluations."),
+                ("reshuffles", self.reshuffles, "Shoe reshuffles.")):
+            lines += [
+                f"# HELP {prefix}_{name}_total {text}",
+                f"# TYPE {prefix}_{name}_total counter",
+                f"{prefix}_{name}_total {value}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.snapshot(), indent = 2))
+
+    def write_prometheus(self, path, prefix = "blackjack"):
+        _write_atomic(path, self.to_prometheus(prefix))
+
+
+class CountingHand(Hand):
+    '''Hand that adds one to metrics.hand_values per value evaluation'''
+
+    def __init__(self, is_dealer, metrics, is_active = False):
+        super().__init__(is_dealer, is_active)
+        self.metrics = metrics
+
+    @property
+    def value(self):
+        self.metrics.hand_values += 1
+        return Hand.value.fget(self)
+
+
+def _write_atomic(path, text):
+    # scrapers such as the node_exporter textfile collector must never see
+    # a half written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
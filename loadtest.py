@@ -0,0 +1,104 @@
+'''Load test for server: many simultaneous players over TCP.
+
+    python -m loadtest --clients 2000 --rounds 20
+    python -m loadtest --clients 2000 --rounds 20 --host 127.0.0.1 --port 8765
+
+Without --port an in-process server with no dealer delay is started.
+Every client plays rounds standing on 17 and times each request, from
+sending a command to the server's reply needing no more input.
+'''
+import argparse
+import asyncio
+import json
+import time
+
+from server import TableServer
+
+
+async def play_client(host, port, rounds, latencies, stand_on = 17):
+    '''Connect, play rounds and append the latency of each request'''
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()
+    value = 0
+    for _ in range(rounds):
+        command = "deal"
+        while True:
+            start = time.perf_counter()
+            writer.write(command.encode() + b"\n")
+            await writer.drain()
+            line = None
+            while line is None:
+                raw = (await reader.readline()).decode().strip()
+                if not raw:
+                    raise ConnectionError("server closed the connection")
+                if raw.startswith("HAND player"):
+                    value = int(raw.rsplit(" ", 1)[1])
+                elif raw == "TURN" or raw.startswith("RESULT"):
+                    line = raw
+            latencies.append(time.perf_counter() - start)
+            if line.startswith("RESULT"):
+                break
+            command = "h" if value < stand_on else "s"
+    writer.write(b"quit\n")
+    await writer.drain()
+    writer.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_load(clients, rounds, host = "127.0.0.1", port = None):
+    '''Run clients concurrent players and return a summary dict'''
+    server = None
+    if port is None:
+        server = TableServer(host, 0, delay = 0.0)
+        await server.start()
+        port = server.port
+
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(play_client(host, port, rounds, latencies) for _ in range(clients)),
+        return_exceptions = True)
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.close()
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    completed = (clients - len(errors)) * rounds
+    return {
+        "clients": clients,
+        "rounds_per_client": rounds,
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "rounds_per_second": round(completed / elapsed, 1) if elapsed else None,
+        "requests": len(latencies),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(max(latencies, default = 0.0) * 1000, 3),
+        },
+    }
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "loadtest", description = "Load test the table server.")
+    parser.add_argument("--clients", type = int, default = 1000)
+    parser.add_argument("--rounds", type = int, default = 10)
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = None)
+    args = parser.parse_args(argv)
+    summary = asyncio.run(
+        run_load(args.clients, args.rounds, args.host, args.port))
+    print(json.dumps(summary, indent = 2))
+
+
+if __name__ == "__main__":
+    main()
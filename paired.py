@@ -0,0 +1,190 @@
+'''Compare player policies with common random numbers.
+
+Every policy plays every round against the same cards: the same initial
+deal, the same cards for its n-th hit, and the same dealer draws. Player
+hits and dealer draws come from two separate streams, so one policy
+taking an extra card does not change the dealer's cards for the others.
+Shuffling and dealing are done once per round for all policies.
+
+Because the policies see the same luck, the variance of the per-round
+payout difference is far smaller than the sum of the two variances that
+separate runs would have to beat.
+
+    python -m paired --policies stand17 basic --rounds 200000 --decks 6
+'''
+import argparse
+import json
+import random
+
+from classes import Hand, Shoe
+from simulator import (
+    BLACKJACK, DEALER_BLACKJACK, POLICY_NAMES, RunningMean, SimulationStats,
+    RoundResult, get_policy, round_payout, settle)
+
+
+class PairedStats:
+    '''Per-policy SimulationStats and the payout difference of every
+    policy against the first (the baseline)'''
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.stats = {name: SimulationStats() for name in self.names}
+        self.differences = {name: RunningMean() for name in self.names[1:]}
+
+    def add(self, results):
+        baseline = results[0].payout
+        for name, result in zip(self.names, results):
+            self.stats[name].add(result)
+        for name, result in zip(self.names[1:], results[1:]):
+            self.differences[name].add(result.payout - baseline)
+
+    def merge(self, other):
+        for name in self.names:
+            self.stats[name].merge(other.stats[name])
+        for name in self.names[1:]:
+            self.differences[name].merge(other.differences[name])
+        return self
+
+    def variance_reduction(self, name):
+        '''How many times fewer rounds the paired comparison needs than
+        independent runs for the same standard error'''
+        diff = self.differences[name].variance
+        independent = (
+            self.stats[self.names[0]].variance + self.stats[name].variance)
+        return independent / diff if diff else float("inf")
+
+    def as_dict(self, confidence = 0.95):
+        baseline = self.names[0]
+        return {
+            "baseline": baseline,
+            "policies": {name: s.as_dict() for name, s in self.stats.items()},
+            "differences": {
+                f"{name} - {baseline}": {
+                    "mean": diff.mean,
+                    "variance": diff.variance,
+                    "std_error": diff.std_error if diff.count else None,
+                    "confidence_interval": diff.confidence_interval(confidence),
+                    "variance_reduction": self.variance_reduction(name),
+                }
+                for name, diff in self.differences.items()},
+        }
+
+
+class PairedSimulator:
+    '''Play several policies on one shared stream of rounds.
+
+    policies maps a name to a policy callable; the first one is the
+    baseline the others are compared with.
+    '''
+
+    def __init__(self, policies, seed = None, num_decks = 1,
+                 penetration = 0.75, blackjack_payout = 1.5):
+        if not policies:
+            raise ValueError("At least one policy is needed")
+        self.names = list(policies)
+        self.policies = list(policies.values())
+        self.rng = random.Random(seed)
+        self.blackjack_payout = blackjack_payout
+        self.deck = Shoe(num_decks, penetration, rng = self.rng)
+        self.player = Hand(is_dealer = False)
+        self.dealer = Hand(is_dealer = True)
+
+    def play_round(self):
+        '''Play one round for every policy and return their RoundResults'''
+        deck = self.deck
+        player = self.player
+        dealer = self.dealer
+        deal = deck.deal
+
+        if deck.needs_shuffle:
+            deck.shuffle()
+
+        # same order as Simulator: dealer, player, dealer, player
+        first = [deal() for _ in range(4)]
+        dealer_cards = first[0::2]
+        player_cards = first[1::2]
+
+        dealer.clear()
+        player.clear()
+        for card in dealer_cards:
+            dealer.add_card(card)
+        for card in player_cards:
+            player.add_card(card)
+
+        if dealer.has_blackjack or player.has_blackjack:
+            outcome = DEALER_BLACKJACK if dealer.has_blackjack else BLACKJACK
+            payout = round_payout(outcome, 1.0, self.blackjack_payout)
+            result = RoundResult(outcome, payout, player.value, dealer.value)
+            return [result] * len(self.policies)
+
+        # extra cards are drawn from the shoe the first time any policy
+        # needs them and reused by the rest
+        hits = []
+        draws = []
+        upcard = dealer_cards[1]
+        results = []
+        for policy in self.policies:
+            player.clear()
+            dealer.clear()
+            for card in player_cards:
+                player.add_card(card)
+            for card in dealer_cards:
+                dealer.add_card(card)
+
+            n = 0
+            while policy(player, upcard) == 'h':
+                if n == len(hits):
+                    hits.append(deal())
+                player.add_card(hits[n])
+                n += 1
+                if player.is_bust:
+                    break
+
+            if not player.is_bust:
+                n = 0
+                while dealer.value <= 16:
+                    if n == len(draws):
+                        draws.append(deal())
+                    dealer.add_card(draws[n])
+                    n += 1
+
+            outcome = settle(player, dealer)
+            payout = round_payout(outcome, 1.0, self.blackjack_payout)
+            results.append(
+                RoundResult(outcome, payout, player.value, dealer.value))
+        return results
+
+    def run(self, rounds, stats = None):
+        if stats is None:
+            stats = PairedStats(self.names)
+        play_round = self.play_round
+        add = stats.add
+        for _ in range(rounds):
+            add(play_round())
+        return stats
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "paired",
+        description = "Compare policies on common random numbers.")
+    parser.add_argument(
+        "--policies", nargs = "+", default = ["stand17", "basic"],
+        choices = POLICY_NAMES, help = "the first one is the baseline")
+    parser.add_argument("--rounds", type = int, default = 100000)
+    parser.add_argument("--seed", type = int, default = None)
+    parser.add_argument("--decks", type = int, default = 1)
+    parser.add_argument("--penetration", type = float, default = 0.75)
+    parser.add_argument("--confidence", type = float, default = 0.95)
+    args = parser.parse_args(argv)
+
+    policies = {name: get_policy(name, args.decks) for name in args.policies}
+    sim = PairedSimulator(
+        policies, seed = args.seed, num_decks = args.decks,
+        penetration = args.penetration)
+    stats = sim.run(args.rounds)
+    print(json.dumps(stats.as_dict(args.confidence), indent = 2))
+
+
+if __name__ == "__main__":
+    main()
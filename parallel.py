@@ -0,0 +1,76 @@
+'''Spread a simulation over a process pool.
+
+The rounds are split into fixed-size chunks and every chunk gets its own
+random.Random seeded from (seed, chunk index), so the merged totals for a
+seed are the same whatever the number of workers.
+'''
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from counting import COUNT_SYSTEMS, bet_ramp
+from simulator import SimulationStats, Simulator, get_policy
+
+# small enough that a default 100k round run still gives every worker of
+# a typical machine some chunks, large enough that pickling the stats back
+# is noise next to playing the rounds
+CHUNK_ROUNDS = 10000
+
+
+def derive_seed(seed, index):
+    '''Independent 64-bit seed for chunk index of a run seeded with seed'''
+    digest = hashlib.sha256(f"{seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _run_chunk(task):
+    policy, seed, index, rounds, num_decks, penetration, count, ramp = task
+    sim = Simulator(
+        get_policy(policy, num_decks), seed = derive_seed(seed, index),
+        num_decks = num_decks, penetration = penetration,
+        count_system = COUNT_SYSTEMS[count] if count else None,
+        bet_sizer = bet_ramp(ramp) if ramp else None)
+    return sim.run(rounds)
+
+
+def run_parallel(rounds, seed = None, workers = None, policy = "stand17",
+                 num_decks = 1, penetration = 0.75, count = None,
+                 ramp = None, chunk_rounds = CHUNK_ROUNDS):
+    '''Simulate rounds over workers processes and return merged
+    SimulationStats.
+
+    Without a seed one is drawn at random; either way it is stored as
+    stats.seed so the run can be repeated.
+
+    Everything is passed by name or plain data so it can be sent to the
+    workers: policy is a name from simulator.POLICY_NAMES, count a name
+    from counting.COUNT_SYSTEMS and ramp a true count bet ramp for
+    counting.bet_ramp.
+    '''
+    get_policy(policy, num_decks)
+    if count is not None and count not in COUNT_SYSTEMS:
+        raise ValueError(
+            f"Unknown count system {count!r}. "
+            f"Valid systems are {sorted(COUNT_SYSTEMS)}")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tasks = [
+        (policy, seed, index, min(chunk_rounds, rounds - start),
+         num_decks, penetration, count, ramp)
+        for index, start in enumerate(range(0, rounds, chunk_rounds))]
+
+    stats = SimulationStats()
+    # merge in chunk order so float totals do not depend on scheduling
+    if workers == 1:
+        for task in tasks:
+            stats.merge(_run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            for chunk_stats in pool.map(_run_chunk, tasks):
+                stats.merge(chunk_stats)
+    stats.seed = seed
+    return stats
@@ -0,0 +1,230 @@
+'''Asyncio table server: one table per connection, many tables per process.
+
+The protocol is line based, UTF-8. Clients send commands:
+
+    deal        start a round
+    h / s       hit or stand when the server sends TURN
+    quit        leave the table
+
+and the server answers with lines of the form
+
+    HAND player <cards> <value>
+    HAND dealer X <cards>           (hole card hidden) or with all cards
+    TURN                            waiting for h or s
+    TIMEOUT                         no action in time, the player stands
+    RESULT <outcome> <payout> <player value> <dealer value>
+    ERR <message>
+
+Rounds follow the same rules as Game and Simulator. Dealer delays use
+asyncio.sleep, so a slow table never holds up the others.
+
+    python -m server --port 8765 --delay 2 --timeout 30
+'''
+import argparse
+import asyncio
+import random
+
+from classes import Hand, Shoe
+from parallel import derive_seed
+from simulator import (
+    BLACKJACK, DEALER_BLACKJACK, OUTCOME_NAMES, round_payout, settle)
+
+
+class TableSession:
+    '''One player at one table, driven by a reader/writer stream pair'''
+
+    def __init__(self, reader, writer, shoe, delay = 0.0,
+                 action_timeout = 30.0, idle_timeout = 300.0,
+                 blackjack_payout = 1.5):
+        self.reader = reader
+        self.writer = writer
+        self.deck = shoe
+        self.delay = delay
+        self.action_timeout = action_timeout
+        self.idle_timeout = idle_timeout
+        self.blackjack_payout = blackjack_payout
+        self.player = Hand(is_dealer = False)
+        self.dealer = Hand(is_dealer = True)
+        self.rounds = 0
+
+    def send(self, line):
+        self.writer.write(line.encode() + b"\n")
+
+    async def read_command(self, timeout):
+        await self.writer.drain()
+        line = await asyncio.wait_for(self.reader.readline(), timeout)
+        if not line:
+            return "quit"
+        return line.decode(errors = "replace").strip().lower()
+
+    def show(self, hand, hide = False):
+        if hand.is_dealer:
+            if hide:
+                cards = " ".join(["X"] + [str(card) for card in hand.cards[1:]])
+                self.send(f"HAND dealer {cards}")
+                return
+            name = "dealer"
+        else:
+            name = "player"
+        cards = " ".join(str(card) for card in hand.cards)
+        self.send(f"HAND {name} {cards} {hand.value}")
+
+    async def run(self):
+        self.send("WELCOME commands: deal, h, s, quit")
+        try:
+            while True:
+                command = await self.read_command(self.idle_timeout)
+                if command == "quit":
+                    break
+                if command == "deal":
+                    if not await self.play_round():
+                        break
+                else:
+                    self.send(f"ERR unknown command {command!r}")
+            self.send("BYE")
+            await self.writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def play_round(self):
+        '''Play one round; returns False if the player quit mid-round'''
+        deck = self.deck
+        player = self.player
+        dealer = self.dealer
+        connected = True
+
+        if deck.needs_shuffle:
+            deck.shuffle()
+        player.clear()
+        dealer.clear()
+        for _ in range(2):
+            dealer.add_card(deck.deal())
+            player.add_card(deck.deal())
+
+        if dealer.has_blackjack:
+            outcome = DEALER_BLACKJACK
+        elif player.has_blackjack:
+            outcome = BLACKJACK
+        else:
+            self.show(player)
+            self.show(dealer, hide = True)
+            while True:
+                self.send("TURN")
+                try:
+                    command = await self.read_command(self.action_timeout)
+                except asyncio.TimeoutError:
+                    self.send("TIMEOUT")
+                    command = "s"
+                if command == "quit":
+                    connected = False
+                    command = "s"
+                if command == "h":
+                    player.add_card(deck.deal())
+                    self.show(player)
+                    if player.is_bust:
+                        break
+                elif command == "s":
+                    break
+                else:
+                    self.send(f"ERR expected h or s, got {command!r}")
+
+            if not player.is_bust:
+                while dealer.value <= 16:
+                    if self.delay:
+                        await self.writer.drain()
+                        await asyncio.sleep(self.delay)
+                    dealer.add_card(deck.deal())
+            outcome = settle(player, dealer)
+
+        self.show(player)
+        self.show(dealer)
+        payout = round_payout(outcome, blackjack_payout = self.blackjack_payout)
+        self.send(
+            f"RESULT {OUTCOME_NAMES[outcome]} {payout} "
+            f"{player.value} {dealer.value}")
+        self.rounds += 1
+        return connected
+
+
+class TableServer:
+    '''Accepts connections and seats each one at its own table'''
+
+    def __init__(self, host = "127.0.0.1", port = 8765, num_decks = 6,
+                 penetration = 0.75, delay = 0.0, action_timeout = 30.0,
+                 idle_timeout = 300.0, seed = None):
+        self.host = host
+        self.port = port
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.delay = delay
+        self.action_timeout = action_timeout
+        self.idle_timeout = idle_timeout
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.tables_opened = 0
+        self.active = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        shoe = Shoe(
+            self.num_decks, self.penetration,
+            rng = random.Random(derive_seed(self.seed, self.tables_opened)))
+        self.tables_opened += 1
+        self.active += 1
+        session = TableSession(
+            reader, writer, shoe, delay = self.delay,
+            action_timeout = self.action_timeout,
+            idle_timeout = self.idle_timeout)
+        try:
+            await session.run()
+        finally:
+            self.active -= 1
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle, self.host, self.port, backlog = 4096)
+        # port 0 picks a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "server", description = "Serve blackjack tables over TCP.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--decks", type = int, default = 6)
+    parser.add_argument("--delay", type = float, default = 2.0,
+                        help = "seconds between dealer draws")
+    parser.add_argument("--timeout", type = float, default = 30.0,
+                        help = "seconds a player has to act before standing")
+    parser.add_argument("--seed", type = int, default = None)
+    args = parser.parse_args(argv)
+
+    server = TableServer(
+        args.host, args.port, num_decks = args.decks, delay = args.delay,
+        action_timeout = args.timeout, seed = args.seed)
+    print(f"Serving tables on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
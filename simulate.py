@@ -0,0 +1,118 @@
+'''Batch simulation entry point.
+
+    python -m simulate --rounds 1000000 --seed 42 --policy stand17
+
+With --target-width the run stops as soon as the confidence interval on
+the house edge (per unit bet) is that narrow, and --rounds becomes the upper limit.
+--checkpoint saves progress periodically; add --resume to continue from
+it with the same options.
+'''
+import argparse
+import json
+import time
+
+from history import HistoryWriter
+from instrument import Metrics
+from parallel import run_parallel
+from simulator import POLICY_NAMES, Simulator, get_policy
+
+
+def parse_args(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "simulate", description = "Run headless blackjack rounds.")
+    parser.add_argument("--rounds", type = int, default = 100000)
+    parser.add_argument("--seed", type = int, default = None)
+    parser.add_argument(
+        "--policy", default = "stand17", choices = POLICY_NAMES)
+    parser.add_argument("--decks", type = int, default = 1)
+    parser.add_argument(
+        "--penetration", type = float, default = 0.75,
+        help = "fraction of the shoe dealt before reshuffling")
+    parser.add_argument(
+        "--workers", type = int, default = None,
+        help = "run over a process pool of this many workers")
+    parser.add_argument(
+        "--history", default = None,
+        help = "append every round to this hand history file")
+    parser.add_argument(
+        "--metrics", default = None,
+        help = "write per-phase timings and counters as JSON")
+    parser.add_argument(
+        "--prometheus", default = None,
+        help = "write per-phase timings and counters as a Prometheus text file")
+    parser.add_argument(
+        "--target-width", type = float, default = None,
+        help = "stop once the confidence interval is this wide")
+    parser.add_argument("--confidence", type = float, default = 0.95)
+    parser.add_argument(
+        "--checkpoint", default = None,
+        help = "save progress to this file during the run")
+    parser.add_argument(
+        "--checkpoint-every", type = float, default = 60.0,
+        help = "seconds between checkpoints")
+    parser.add_argument(
+        "--resume", action = "store_true",
+        help = "continue the run saved in --checkpoint")
+    return parser.parse_args(argv)
+
+
+def main(argv = None):
+    args = parse_args(argv)
+
+    if args.workers and (args.history or args.metrics or args.prometheus
+                         or args.target_width or args.checkpoint):
+        raise SystemExit(
+            "--history, --metrics, --prometheus, --target-width and "
+            "--checkpoint can not be combined with --workers")
+    if args.resume and not args.checkpoint:
+        raise SystemExit("--resume needs --checkpoint")
+
+    start = time.perf_counter()
+    played_before = 0
+    if args.workers:
+        stats = run_parallel(
+            args.rounds, seed = args.seed, workers = args.workers,
+            policy = args.policy, num_decks = args.decks,
+            penetration = args.penetration)
+    else:
+        recorder = HistoryWriter(args.history) if args.history else None
+        metrics = Metrics() if args.metrics or args.prometheus else None
+        sim = Simulator(
+            get_policy(args.policy, args.decks), seed = args.seed,
+            num_decks = args.decks, penetration = args.penetration,
+            recorder = recorder, metrics = metrics)
+        stats = sim.load_checkpoint(args.checkpoint) if args.resume else None
+        played_before = stats.rounds if stats else 0
+        if args.target_width or args.checkpoint:
+            stats = sim.run_until(
+                args.target_width or 0.0, confidence = args.confidence,
+                min_rounds = 0, max_rounds = args.rounds,
+                check_every = min(10000, args.rounds), stats = stats,
+                checkpoint = args.checkpoint,
+                checkpoint_every = args.checkpoint_every)
+        else:
+            stats = sim.run(args.rounds)
+        if recorder is not None:
+            recorder.close()
+        if args.metrics:
+            metrics.write_json(args.metrics)
+        if args.prometheus:
+            metrics.write_prometheus(args.prometheus)
+    elapsed = time.perf_counter() - start
+
+    played = stats.rounds - played_before
+    summary = stats.as_dict()
+    summary["policy"] = args.policy
+    summary["seed"] = stats.seed if args.workers else args.seed
+    summary["decks"] = args.decks
+    summary["workers"] = args.workers
+    if stats.rounds:
+        summary["confidence_interval"] = stats.confidence_interval(args.confidence)
+        summary["house_edge_interval"] = stats.house_edge_interval(args.confidence)
+    summary["seconds"] = round(elapsed, 3)
+    summary["rounds_per_second"] = round(played / elapsed) if elapsed else None
+    print(json.dumps(summary, indent = 2))
+
+
+if __name__ == "__main__":
+    main()
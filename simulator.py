@@ -0,0 +1,477 @@
+import math
+import os
+import pickle
+import random
+import time
+from collections import namedtuple
+from statistics import NormalDist
+from time import perf_counter_ns as clock
+
+from classes import Hand, Shoe
+
+# round outcomes, from the player's point of view
+LOSS = 0
+WIN = 1
+BLACKJACK = 2
+BUST = 3
+DEALER_BUST = 4
+DEALER_BLACKJACK = 5
+
+OUTCOME_NAMES = {
+    LOSS: "loss",
+    WIN: "win",
+    BLACKJACK: "blackjack",
+    BUST: "bust",
+    DEALER_BUST: "dealer_bust",
+    DEALER_BLACKJACK: "dealer_blackjack",
+}
+
+# payout is the amount won or lost, already multiplied by bet
+RoundResult = namedtuple(
+    "RoundResult", ["outcome", "payout", "player_value", "dealer_value", "bet"],
+    defaults = [1.0])
+
+
+def stand_on(total):
+    '''Policy that hits until the hand is worth at least total'''
+    def policy(hand, upcard):
+        return 'h' if hand.value < total else 's'
+    policy.__name__ = f"stand_on_{total}"
+    return policy
+
+
+def always_stand(hand, upcard):
+    return 's'
+
+
+def stand_table(total, soft_total = None):
+    '''Strategy table that hits hard hands below total and soft hands
+    below soft_total (defaults to total).
+
+    Tables are indexed table[is_soft][hand value][upcard points] and hold
+    'h' or 's'; upcard points are 1 for an ace, 2-10 otherwise.
+    '''
+    if soft_total is None:
+        soft_total = total
+    return [
+        [['h' if value < limit else 's' for _ in range(11)]
+         for value in range(22)]
+        for limit in (total, soft_total)]
+
+
+def table_policy(table):
+    '''Policy that looks its decision up in a strategy table'''
+    def policy(hand, upcard):
+        return table[hand.is_soft][hand.value][upcard.points]
+    return policy
+
+
+POLICIES = {
+    "stand17": stand_on(17),
+    "never_bust": stand_on(12),
+    "always_stand": always_stand,
+}
+
+# "basic" plays the solver's table for the number of decks in use
+POLICY_NAMES = sorted([*POLICIES, "basic"])
+
+
+def get_policy(name, num_decks = 1):
+    '''Look up a named player policy'''
+    if name == "basic":
+        from solver import basic_table
+        return table_policy(basic_table(num_decks))
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown policy {name!r}. Valid policies are {POLICY_NAMES}")
+
+
+def dealer_draw(dealer, deal):
+    '''Draw for the dealer until the hand is worth 17 or more'''
+    while dealer.value <= 16:
+        dealer.add_card(deal())
+
+
+def settle(player, dealer):
+    '''Outcome of a round where neither side has blackjack'''
+    if player.is_bust:
+        return BUST
+    if dealer.is_bust:
+        return DEALER_BUST
+    if dealer.value >= player.value:
+        return LOSS
+    return WIN
+
+
+def round_payout(outcome, bet = 1.0, blackjack_payout = 1.5):
+    '''Amount won (or lost, when negative) on a round'''
+    if outcome == BLACKJACK:
+        return blackjack_payout * bet
+    if outcome == WIN or outcome == DEALER_BUST:
+        return bet
+    return -bet
+
+
+class RunningMean:
+    '''Mean and variance of a stream of values in constant memory.
+
+    Uses Welford's online algorithm, and Chan's pairwise update to merge.
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count:
+            delta = other.mean - self.mean
+            self._m2 += other._m2 + delta * delta * self.count * other.count / count
+            self.mean += delta * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        '''Sample variance'''
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_error(self):
+        return math.sqrt(self.variance / self.count) if self.count else math.inf
+
+    def confidence_interval(self, confidence = 0.95):
+        '''Normal approximation interval for the mean'''
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * self.std_error
+        return self.mean - half_width, self.mean + half_width
+
+
+class RunningRatio:
+    '''Ratio of the means of two paired streams, e.g. payout per unit bet.
+
+    Both streams and their co-moment are kept with Welford updates; the
+    standard error of the ratio uses the delta method.
+    '''
+
+    def __init__(self):
+        self.numerator = RunningMean()
+        self.denominator = RunningMean()
+        self._cm = 0.0
+
+    @property
+    def count(self):
+        return self.numerator.count
+
+    def add(self, y, x):
+        dx = x - self.denominator.mean
+        self.numerator.add(y)
+        self.denominator.add(x)
+        self._cm += dx * (y - self.numerator.mean)
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count:
+            dx = other.denominator.mean - self.denominator.mean
+            dy = other.numerator.mean - self.numerator.mean
+            self._cm += other._cm + dx * dy * self.count * other.count / count
+        self.numerator.merge(other.numerator)
+        self.denominator.merge(other.denominator)
+        return self
+
+    @property
+    def ratio(self):
+        x = self.denominator.mean
+        return self.numerator.mean / x if x else 0.0
+
+    @property
+    def std_error(self):
+        n = self.count
+        x = self.denominator.mean
+        if n < 2 or not x:
+            return math.inf
+        r = self.ratio
+        covariance = self._cm / (n - 1)
+        variance = (self.numerator.variance - 2 * r * covariance
+                    + r * r * self.denominator.variance)
+        return math.sqrt(max(variance, 0.0) / n) / abs(x)
+
+    def confidence_interval(self, confidence = 0.95):
+        '''Normal approximation interval for the ratio'''
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * self.std_error
+        return self.ratio - half_width, self.ratio + half_width
+
+
+class SimulationStats:
+    '''Aggregate results of many rounds in constant memory.
+
+    mean_payout and its interval are per round; house_edge and its
+    interval are per unit bet, which differs once a bet sizer is used.
+    '''
+
+    def __init__(self):
+        self.rounds = 0
+        self.total_payout = 0.0
+        self.total_bet = 0.0
+        self.outcomes = [0] * len(OUTCOME_NAMES)
+        self.payout = RunningRatio()
+
+    def add(self, result):
+        self.rounds += 1
+        self.total_payout += result.payout
+        self.total_bet += result.bet
+        self.outcomes[result.outcome] += 1
+        self.payout.add(result.payout, result.bet)
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.total_payout += other.total_payout
+        self.total_bet += other.total_bet
+        for i, n in enumerate(other.outcomes):
+            self.outcomes[i] += n
+        self.payout.merge(other.payout)
+        return self
+
+    @property
+    def mean_payout(self):
+        return self.total_payout / self.rounds if self.rounds else 0.0
+
+    @property
+    def variance(self):
+        '''Sample variance of the per-round payout'''
+        return self.payout.numerator.variance
+
+    @property
+    def std_error(self):
+        return self.payout.numerator.std_error
+
+    def confidence_interval(self, confidence = 0.95):
+        '''Normal approximation interval for the mean payout per round'''
+        return self.payout.numerator.confidence_interval(confidence)
+
+    @property
+    def house_edge(self):
+        '''Amount lost per unit bet'''
+        return -self.total_payout / self.total_bet if self.total_bet else 0.0
+
+    @property
+    def house_edge_std_error(self):
+        return self.payout.std_error
+
+    def house_edge_interval(self, confidence = 0.95):
+        '''Normal approximation interval for the house edge'''
+        low, high = self.payout.confidence_interval(confidence)
+        return -high, -low
+
+    def frequencies(self):
+        return {
+            OUTCOME_NAMES[i]: n / self.rounds if self.rounds else 0.0
+            for i, n in enumerate(self.outcomes)}
+
+    def as_dict(self):
+        return {
+            "rounds": self.rounds,
+            "total_payout": self.total_payout,
+            "mean_payout": self.mean_payout,
+            "variance": self.variance,
+            "std_error": self.std_error if self.rounds else None,
+            "total_bet": self.total_bet,
+            "house_edge": self.house_edge,
+            "house_edge_std_error":
+                self.house_edge_std_error if self.rounds > 1 else None,
+            "outcomes": {
+                OUTCOME_NAMES[i]: n for i, n in enumerate(self.outcomes)},
+        }
+
+    def __repr__(self):
+        return f"SimulationStats({self.as_dict()})"
+
+
+# bump when the pickled layout of save_checkpoint changes
+CHECKPOINT_VERSION = 2
+
+
+class Simulator:
+    '''Play rounds of Game without any console input or output.
+
+    policy is a callable taking (hand, upcard) and returning 'h' or 's',
+    the same answers Hand.player_choice accepts. upcard is the dealer card
+    the player can see. Cards come from a Shoe of num_decks decks that is
+    reshuffled at the given penetration.
+
+    count_system (see counting) makes the shoe keep a running count, and
+    bet_sizer is called with the shoe before every round to get the bet.
+    Every round is passed to recorder, e.g. a history.HistoryWriter, and
+    timed into metrics, an instrument.Metrics, when one is given.
+    '''
+
+    def __init__(self, policy, seed = None, num_decks = 1,
+                 penetration = 0.75, blackjack_payout = 1.5,
+                 count_system = None, bet_sizer = None, recorder = None,
+                 metrics = None):
+        self.policy = policy
+        self.recorder = recorder
+        self.metrics = metrics
+        self.rng = random.Random(seed)
+        self.blackjack_payout = blackjack_payout
+        self.bet_sizer = bet_sizer
+        self.deck = Shoe(
+            num_decks, penetration, rng = self.rng,
+            count_system = count_system)
+        if metrics is not None:
+            # these count their own value evaluations
+            self.player = metrics.hand(is_dealer = False)
+            self.dealer = metrics.hand(is_dealer = True)
+        else:
+            self.player = Hand(is_dealer = False)
+            self.dealer = Hand(is_dealer = True)
+
+    def play_round(self):
+        '''Play a single round and return its RoundResult'''
+        deck = self.deck
+        player = self.player
+        dealer = self.dealer
+        metrics = self.metrics
+        if metrics is not None:
+            t_start = clock()
+
+        shuffled = deck.needs_shuffle
+        if shuffled:
+            deck.shuffle()
+        bet = self.bet_sizer(deck) if self.bet_sizer else 1.0
+        player.clear()
+        dealer.clear()
+
+        deal = deck.deal
+        for _ in range(2):
+            dealer.add_card(deal())
+            player.add_card(deal())
+
+        if metrics is not None:
+            t_dealt = clock()
+        dealer_blackjack = dealer.has_blackjack
+        player_blackjack = not dealer_blackjack and player.has_blackjack
+        if metrics is not None:
+            t_checked = t_played = clock()
+
+        if dealer_blackjack:
+            outcome = DEALER_BLACKJACK
+        elif player_blackjack:
+            outcome = BLACKJACK
+        else:
+            policy = self.policy
+            upcard = dealer.cards[1]
+            while policy(player, upcard) == 'h':
+                player.add_card(deal())
+                if player.is_bust:
+                    break
+            if metrics is not None:
+                t_played = clock()
+            if not player.is_bust:
+                dealer_draw(dealer, deal)
+            outcome = None
+
+        if metrics is not None:
+            t_drawn = clock()
+        if outcome is None:
+            outcome = settle(player, dealer)
+
+        # round_payout, inlined
+        if outcome == BLACKJACK:
+            payout = self.blackjack_payout * bet
+        elif outcome == WIN or outcome == DEALER_BUST:
+            payout = bet
+        else:
+            payout = -bet
+
+        if self.recorder is not None:
+            self.recorder.record(player, dealer, outcome, payout, bet)
+        result = RoundResult(outcome, payout, player.value, dealer.value, bet)
+
+        if metrics is not None:
+            metrics.add_round(
+                t_start, t_dealt, t_checked, t_played, t_drawn, clock(),
+                outcome, len(player.cards) + len(dealer.cards), shuffled)
+        return result
+
+    def run(self, rounds, stats = None):
+        '''Play a number of rounds and return the aggregate SimulationStats'''
+        if stats is None:
+            stats = SimulationStats()
+        play_round = self.play_round
+        add = stats.add
+        for _ in range(rounds):
+            add(play_round())
+        return stats
+
+    def run_until(self, target_width, confidence = 0.95, min_rounds = 10000,
+                  max_rounds = None, check_every = 10000, stats = None,
+                  checkpoint = None, checkpoint_every = 60.0):
+        '''Play until the confidence interval on the house edge (per unit
+        bet) is at most target_width wide.
+
+        The width is checked every check_every rounds once min_rounds have
+        been played; max_rounds caps the run. With a checkpoint path the
+        run is saved there every checkpoint_every seconds and at the end,
+        and load_checkpoint continues it exactly.
+        '''
+        if stats is None:
+            stats = SimulationStats()
+        last_saved = time.monotonic()
+        while True:
+            rounds = check_every
+            if max_rounds is not None:
+                rounds = min(rounds, max_rounds - stats.rounds)
+            self.run(rounds, stats)
+
+            if checkpoint and time.monotonic() - last_saved >= checkpoint_every:
+                self.save_checkpoint(checkpoint, stats)
+                last_saved = time.monotonic()
+
+            if stats.rounds >= min_rounds:
+                low, high = stats.house_edge_interval(confidence)
+                if high - low <= target_width:
+                    break
+            if max_rounds is not None and stats.rounds >= max_rounds:
+                break
+
+        if checkpoint:
+            self.save_checkpoint(checkpoint, stats)
+        return stats
+
+    def save_checkpoint(self, path, stats):
+        '''Save the RNG, shoe and stats so the run can be resumed'''
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "rng": self.rng.getstate(),
+            "shoe": self.deck.get_state(),
+            "stats": stats,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def load_checkpoint(self, path):
+        '''Restore a checkpoint into this simulator and return its stats.
+
+        The simulator must be built with the same settings (policy, decks,
+        count system, bet sizer) as the one that saved it.
+        '''
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {state.get('version')}")
+        self.deck.set_state(state["shoe"])
+        self.rng.setstate(state["rng"])
+        return state["stats"]
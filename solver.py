@@ -0,0 +1,128 @@
+'''Basic strategy for the Game rules by dynamic programming.
+
+For every player hand (value, soft or hard) and dealer upcard the solver
+works out the expected value of standing and of hitting, and keeps the
+better one. Rules follow Game: the dealer checks for blackjack before the
+player acts, draws to 17 and wins ties. There is no double or split in
+Game, so only hit and stand are solved.
+
+The player's draws are taken from the full shoe less the dealer upcard,
+i.e. the strategy depends on hand totals, not on the exact cards held.
+
+    python -m solver --decks 6 --out basic6.json
+'''
+import argparse
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+from dealer_probs import DEALER_OUTCOMES, dealer_probabilities, full_composition
+
+Solution = namedtuple("Solution", ["table", "stand_ev", "hit_ev"])
+
+
+def _stand_ev(value, dealer):
+    '''EV of standing on value against a dealer without blackjack'''
+    ev = dealer["bust"]
+    for final in DEALER_OUTCOMES[:5]:
+        ev += dealer[final] if value > final else -dealer[final]
+    return ev
+
+
+def _solve_upcard(upcard, num_decks):
+    composition = full_composition(num_decks)
+    composition[upcard - 1] -= 1
+    total = sum(composition)
+    draws = [(i + 1, n / total) for i, n in enumerate(composition) if n]
+
+    # the player only acts when the dealer does not have blackjack
+    dealer = dealer_probabilities(upcard, composition)
+    no_blackjack = 1.0 - dealer["blackjack"]
+    dealer = {k: p / no_blackjack for k, p in dealer.items() if k != "blackjack"}
+
+    @lru_cache(maxsize = None)
+    def stand(hard, has_ace):
+        value = hard + 10 if has_ace and hard <= 11 else hard
+        return _stand_ev(value, dealer)
+
+    @lru_cache(maxsize = None)
+    def hit(hard, has_ace):
+        ev = 0.0
+        for points, p in draws:
+            new_hard = hard + points
+            if new_hard > 21:
+                ev -= p
+            else:
+                new_ace = has_ace or points == 1
+                ev += p * max(stand(new_hard, new_ace), hit(new_hard, new_ace))
+        return ev
+
+    return stand, hit
+
+
+@lru_cache(maxsize = 8)
+def solve(num_decks = 1):
+    '''Solve every state for a shoe of num_decks decks.
+
+    Returns a Solution whose table, stand_ev and hit_ev are indexed
+    [is_soft][hand value][upcard points] like simulator.stand_table.
+    Impossible states (e.g. soft 5) are left as 'h' with EV 0.
+    '''
+    table = [[['h'] * 11 for _ in range(22)] for _ in range(2)]
+    stand_ev = [[[0.0] * 11 for _ in range(22)] for _ in range(2)]
+    hit_ev = [[[0.0] * 11 for _ in range(22)] for _ in range(2)]
+
+    for upcard in range(1, 11):
+        stand, hit = _solve_upcard(upcard, num_decks)
+        states = [(0, value, value, False) for value in range(2, 22)]
+        states += [(1, value, value - 10, True) for value in range(12, 22)]
+        for soft, value, hard, has_ace in states:
+            stand_ev[soft][value][upcard] = stand(hard, has_ace)
+            hit_ev[soft][value][upcard] = hit(hard, has_ace)
+            if stand_ev[soft][value][upcard] >= hit_ev[soft][value][upcard]:
+                table[soft][value][upcard] = 's'
+
+    return Solution(table, stand_ev, hit_ev)
+
+
+def basic_table(num_decks = 1):
+    return solve(num_decks).table
+
+
+def save_table(table, path):
+    with open(path, "w") as f:
+        json.dump(table, f)
+
+
+def load_table(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_table(table):
+    '''Human readable grid of the table for the reachable hands'''
+    header = "      " + " ".join(f"{'A' if u == 1 else u:>2}" for u in range(1, 11))
+    lines = [header]
+    for soft, values in ((0, range(4, 22)), (1, range(13, 22))):
+        for value in values:
+            label = f"{'S' if soft else 'H'}{value}"
+            row = " ".join(f"{table[soft][value][u]:>2}" for u in range(1, 11))
+            lines.append(f"{label:>5} {row}")
+    return "\n".join(lines)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        prog = "solver", description = "Solve basic strategy for Game.")
+    parser.add_argument("--decks", type = int, default = 1)
+    parser.add_argument("--out", default = None, help = "write the table as JSON")
+    args = parser.parse_args(argv)
+
+    table = basic_table(args.decks)
+    print(format_table(table))
+    if args.out:
+        save_table(table, args.out)
+
+
+if __name__ == "__main__":
+    main()
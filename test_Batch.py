@@ -0,0 +1,50 @@
+from classes import Card
+from simulator import Simulator, stand_table, table_policy
+import unittest
+
+try:
+    import numpy as np
+    from batch import play_batch, shuffled_decks
+except ImportError:
+    np = None
+
+
+class ReplayRng:
+    '''Stands in for random.Random, "shuffling" into the next given deck'''
+    def __init__(self, decks):
+        self.decks = iter(decks)
+
+    def shuffle(self, cards):
+        cards[:] = [Card.from_code(int(code)) for code in next(self.decks)]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatch(unittest.TestCase):
+    def check_matches_scalar(self, table, rounds = 3000):
+        decks = shuffled_decks(rounds, rng = 5)
+        batch = play_batch(decks, table)
+
+        sim = Simulator(table_policy(table), penetration = 0)
+        sim.deck.rng = ReplayRng(decks)
+        for i in range(rounds):
+            result = sim.play_round()
+            self.assertEqual(result.outcome, batch.outcome[i])
+            self.assertEqual(result.payout, batch.payout[i])
+            self.assertEqual(result.player_value, batch.player_value[i])
+            self.assertEqual(result.dealer_value, batch.dealer_value[i])
+
+    def test_matches_scalar_stand17(self):
+        self.check_matches_scalar(stand_table(17))
+
+    def test_matches_scalar_soft_hits(self):
+        self.check_matches_scalar(stand_table(15, soft_total = 19))
+
+    def test_shuffled_decks_are_full_decks(self):
+        decks = shuffled_decks(10, rng = 1, num_decks = 2)
+        self.assertEqual(decks.shape, (10, 104))
+        for row in decks:
+            self.assertEqual(sorted(row), sorted(list(range(52)) * 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+from benchmarks import BENCHMARKS, compare, measure
+import unittest
+
+class TestBenchmarks(unittest.TestCase):
+    def test_every_benchmark_runs(self):
+        for name, (setup, _) in BENCHMARKS.items():
+            result = measure(setup, number = 20, repeat = 1)
+            self.assertGreater(result["ns_per_op"], 0, name)
+            self.assertGreaterEqual(result["peak_bytes"], 0, name)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"a": {"ns_per_op": 100.0}, "b": {"ns_per_op": 100.0}}
+        results = {
+            "a": {"ns_per_op": 109.0},
+            "b": {"ns_per_op": 125.0},
+            "c": {"ns_per_op": 999.0}}
+        self.assertEqual(compare(results, baseline, threshold = 0.1), ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+from classes import Card, CARDS, Deck
+import unittest
+
+class TestCard(unittest.TestCase):
+    def test_codes_match_deck_order(self):
+        deck = Deck()
+        deck.fill_deck()
+        self.assertEqual([card.code for card in deck.cards], list(range(52)))
+
+    def test_from_code(self):
+        for card in CARDS:
+            self.assertIs(Card.from_code(card.code), card)
+        self.assertEqual(Card.from_code(0), Card("A", "C"))
+
+    def test_points(self):
+        self.assertEqual(Card("A", "H").points, 1)
+        self.assertTrue(Card("A", "H").is_ace)
+        self.assertEqual(Card("7", "H").points, 7)
+        self.assertEqual(Card("K", "H").points, 10)
+
+    def test_invalid_card(self):
+        with self.assertRaises(ValueError):
+            Card("11", "H")
+        with self.assertRaises(ValueError):
+            Card("A", "Spades")
+
+    def test_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            Card("A", "H").__dict__
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from classes import Card, Hand
+from dealer_probs import (
+    DealerCalculator, dealer_probabilities, full_composition,
+    composition_from_cards, encode_composition)
+from simulator import dealer_draw
+from itertools import permutations
+import unittest
+
+def enumerate_dealer(upcard, cards):
+    '''Brute force over every order of the remaining cards'''
+    counts = {}
+    orders = list(permutations(range(len(cards))))
+    for order in orders:
+        dealer = Hand(is_dealer = True)
+        dealer.add_card(upcard)
+        deal = iter(cards[i] for i in order).__next__
+        dealer.add_card(deal())
+        if dealer.has_blackjack:
+            key = "blackjack"
+        else:
+            dealer_draw(dealer, deal)
+            key = "bust" if dealer.is_bust else dealer.value
+        counts[key] = counts.get(key, 0) + 1
+    return {key: n / len(orders) for key, n in counts.items()}
+
+class TestDealerProbs(unittest.TestCase):
+    def check_against_enumeration(self, upcard, ranks):
+        cards = [Card(rank, "S") for rank in ranks]
+        expected = enumerate_dealer(upcard, cards)
+        result = dealer_probabilities(upcard, composition_from_cards(cards))
+        for key, p in result.items():
+            self.assertAlmostEqual(p, expected.get(key, 0.0))
+
+    def test_matches_enumeration_ace_up(self):
+        self.check_against_enumeration(
+            Card("A", "H"), ["A", "2", "5", "6", "10", "K", "3"])
+
+    def test_matches_enumeration_six_up(self):
+        self.check_against_enumeration(
+            Card("6", "H"), ["A", "A", "4", "5", "10", "8", "2"])
+
+    def test_sums_to_one(self):
+        for upcard in range(1, 11):
+            composition = full_composition(6)
+            composition[upcard - 1] -= 1
+            result = dealer_probabilities(upcard, composition)
+            self.assertAlmostEqual(sum(result.values()), 1.0)
+
+    def test_ten_up_blackjack_probability(self):
+        composition = full_composition(1)
+        composition[9] -= 1
+        result = dealer_probabilities(10, composition)
+        self.assertAlmostEqual(result["blackjack"], 4 / 51)
+
+    def test_cache_is_bounded(self):
+        calculator = DealerCalculator(cache_size = 100)
+        calculator.probabilities(6, full_composition(2))
+        info = calculator.cache_info()
+        self.assertEqual(info.maxsize, 100)
+        self.assertLessEqual(info.currsize, 100)
+
+    def test_encode_rejects_large_counts(self):
+        with self.assertRaises(ValueError):
+            encode_composition([600] + [0] * 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
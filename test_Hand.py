@@ -1,46 +1,108 @@
 from classes import Hand, Card
+import pickle
 import unittest
 
 class TestHand(unittest.TestCase):
     def test_has_blackjack_true(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("A", "Spades"), Card("10", "Clubs")]
-        self.assertTrue(hand_1.has_blackjack())
+        hand_1.cards = [Card("A", "S"), Card("10", "C")]
+        self.assertTrue(hand_1.has_blackjack)
 
     def test_has_blackjack_21_with_3_cards(self):
         hand_1 = Hand(is_dealer = False)    
-        hand_1.cards = [Card("A", "Spades"), Card("8", "Clubs"), Card("2", "clubs")]
-        self.assertFalse(hand_1.has_blackjack())    
+        hand_1.cards = [Card("A", "S"), Card("8", "C"), Card("2", "C")]
+        self.assertFalse(hand_1.has_blackjack)    
 
     def test_value_with_one_ace(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("A", "Spades"), Card("5", "Clubs")]
+        hand_1.cards = [Card("A", "S"), Card("5", "C")]
         self.assertEqual(hand_1.value, 16)
 
     def test_value_with_two_ace(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("A", "Spades"), Card("A", "Clubs"), Card("10", "Clubs")]
+        hand_1.cards = [Card("A", "S"), Card("A", "C"), Card("10", "C")]
         self.assertEqual(hand_1.value, 12)
 
     def test_value_with_two_ace2(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("A", "Spades"), Card("A", "Clubs"), Card("9", "Clubs")]
+        hand_1.cards = [Card("A", "S"), Card("A", "C"), Card("9", "C")]
         self.assertEqual(hand_1.value, 21)
 
     def test_value_facecards(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("J", "Spades"), Card("Q", "Clubs"), Card("K", "Clubs")]
+        hand_1.cards = [Card("J", "S"), Card("Q", "C"), Card("K", "C")]
         self.assertEqual(hand_1.value, 30)
 
     def test_is_bust_true(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("J", "Spades"), Card("Q", "Clubs"), Card("Q", "Clubs")]
-        self.assertTrue(hand_1.is_bust())
+        hand_1.cards = [Card("J", "S"), Card("Q", "C"), Card("Q", "C")]
+        self.assertTrue(hand_1.is_bust)
 
     def test_is_bust_false(self):
         hand_1 = Hand(is_dealer = False)  
-        hand_1.cards = [Card("J", "Spades"), Card("Q", "Clubs")]
-        self.assertFalse(hand_1.is_bust())
+        hand_1.cards = [Card("J", "S"), Card("Q", "C")]
+        self.assertFalse(hand_1.is_bust)
+
+    def test_value_updates_with_add_card(self):
+        hand_1 = Hand(is_dealer = False)
+        hand_1.add_card(Card("A", "S"))
+        self.assertEqual(hand_1.value, 11)
+        self.assertTrue(hand_1.is_soft)
+        hand_1.add_card(Card("6", "C"))
+        self.assertEqual(hand_1.value, 17)
+        hand_1.add_card(Card("10", "C"))
+        self.assertEqual(hand_1.value, 17)
+        self.assertFalse(hand_1.is_soft)
+        hand_1.clear()
+        self.assertEqual(hand_1.value, 0)
+
+    def test_value_with_cards_appended_directly(self):
+        hand_1 = Hand(is_dealer = False)
+        hand_1.add_card(Card("9", "S"))
+        hand_1.cards.append(Card("A", "D"))
+        self.assertEqual(hand_1.value, 20)
+        hand_1.add_card(Card("5", "D"))
+        self.assertEqual(hand_1.value, 15)
+
+    def test_value_after_pop_and_add(self):
+        hand_1 = Hand(is_dealer = False)
+        hand_1.add_card(Card("10", "S"))
+        hand_1.add_card(Card("9", "C"))
+        hand_1.cards.pop()
+        hand_1.add_card(Card("A", "S"))
+        self.assertEqual(hand_1.value, 21)
+        self.assertTrue(hand_1.has_blackjack)
+
+    def test_value_after_item_replacement(self):
+        hand_1 = Hand(is_dealer = False)
+        hand_1.add_card(Card("10", "S"))
+        hand_1.add_card(Card("9", "C"))
+        hand_1.cards[1] = Card("2", "S")
+        self.assertEqual(hand_1.value, 12)
+        hand_1.add_card(Card("5", "D"))
+        hand_1.cards[0] = Card("A", "D")
+        self.assertEqual(hand_1.value, 18)
+        self.assertTrue(hand_1.is_soft)
+
+    def test_value_after_assigned_list(self):
+        hand_1 = Hand(is_dealer = False)
+        hand_1.cards = [Card("K", "S"), Card("5", "C")]
+        self.assertEqual(hand_1.value, 15)
+        del hand_1.cards[0]
+        self.assertEqual(hand_1.value, 5)
+
+    def test_pickle_round_trip(self):
+        hand_1 = Hand(is_dealer = True, is_active = True)
+        hand_1.add_card(Card("A", "S"))
+        hand_1.add_card(Card("6", "C"))
+        hand_2 = pickle.loads(pickle.dumps(hand_1))
+        self.assertEqual(hand_2.cards, hand_1.cards)
+        self.assertTrue(hand_2.is_dealer)
+        self.assertEqual(hand_2.value, 17)
+        hand_2.cards.pop()
+        hand_2.add_card(Card("K", "D"))
+        self.assertEqual(hand_2.value, 21)
+        self.assertEqual(hand_1.value, 17)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+from history import HistoryWriter, HistoryReader, NO_CARD, RECORD_SIZE, HEADER_SIZE
+from simulator import Simulator, stand_on, BUST
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RecordingList:
+    '''Recorder that keeps what Simulator passes it'''
+    def __init__(self, writer):
+        self.writer = writer
+        self.rounds = []
+
+    def record(self, player, dealer, outcome, payout, bet):
+        self.rounds.append(
+            ([c.code for c in player.cards], [c.code for c in dealer.cards],
+             outcome, payout))
+        self.writer.record(player, dealer, outcome, payout, bet)
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "hands.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_file_size(self):
+        with HistoryWriter(self.path, buffer_records = 64) as writer:
+            stats = Simulator(stand_on(17), seed = 1, recorder = writer).run(1000)
+        self.assertEqual(writer.written, stats.rounds)
+        self.assertEqual(
+            os.path.getsize(self.path), HEADER_SIZE + 1000 * RECORD_SIZE)
+
+    def test_appends_to_existing_file(self):
+        for seed in (1, 2):
+            with HistoryWriter(self.path) as writer:
+                Simulator(stand_on(17), seed = seed, recorder = writer).run(10)
+        self.assertEqual(
+            os.path.getsize(self.path), HEADER_SIZE + 20 * RECORD_SIZE)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_appends_after_torn_record(self):
+        with HistoryWriter(self.path) as writer:
+            stats_1 = Simulator(stand_on(17), seed = 1, recorder = writer).run(5)
+        with open(self.path, "ab") as f:
+            f.write(b"\x07" * 7)
+        with HistoryWriter(self.path) as writer:
+            stats_2 = Simulator(stand_on(17), seed = 2, recorder = writer).run(5)
+        self.assertEqual(
+            os.path.getsize(self.path), HEADER_SIZE + 10 * RECORD_SIZE)
+
+        reader = HistoryReader(self.path)
+        self.assertEqual(len(reader), 10)
+        self.assertTrue((reader["outcome"] <= 5).all())
+        self.assertAlmostEqual(
+            float(reader["payout"][5:].sum()), stats_2.total_payout)
+        self.assertAlmostEqual(
+            float(reader["payout"][:5].sum()), stats_1.total_payout)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a history file")
+        with self.assertRaises(ValueError):
+            HistoryWriter(self.path)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_reader_columns_match_rounds(self):
+        writer = HistoryWriter(self.path, buffer_records = 100)
+        recorder = RecordingList(writer)
+        stats = Simulator(stand_on(17), seed = 4, recorder = recorder).run(500)
+        writer.close()
+
+        reader = HistoryReader(self.path)
+        self.assertEqual(len(reader), 500)
+        self.assertIsInstance(reader["payout"].base, np.memmap)
+        self.assertAlmostEqual(float(reader["payout"].sum()), stats.total_payout)
+        for i, (player, dealer, outcome, payout) in enumerate(recorder.rounds):
+            n_player = reader["n_player"][i]
+            self.assertEqual(list(reader["player_cards"][i][:n_player]), player)
+            self.assertEqual(reader["player_cards"][i][n_player], NO_CARD)
+            self.assertEqual(list(reader["dealer_cards"][i][:reader["n_dealer"][i]]), dealer)
+            self.assertEqual(reader["outcome"][i], outcome)
+            hits = len(player) - 2
+            if hits:
+                self.assertEqual(reader["actions"][i], (1 << hits) - 1)
+            if outcome == BUST:
+                self.assertEqual(reader["n_actions"][i], hits)
+
+
+if __name__ == "__main__":
+    unittest.main()
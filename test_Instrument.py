@@ -0,0 +1,65 @@
+from classes import Card, Hand
+from instrument import Metrics, PHASES
+from simulator import Simulator, stand_on
+import json
+import os
+import tempfile
+import unittest
+
+class TestMetrics(unittest.TestCase):
+    def test_counts_match_simulation(self):
+        metrics = Metrics()
+        sim = Simulator(stand_on(17), seed = 3, num_decks = 2, metrics = metrics)
+        stats = sim.run(2000)
+        self.assertEqual(metrics.rounds, 2000)
+        self.assertEqual(metrics.outcomes, stats.outcomes)
+        self.assertEqual(metrics.reshuffles, sim.deck.shuffles - 1)
+        self.assertGreater(metrics.cards_dealt, 8000)
+        self.assertGreater(metrics.hand_values, 2000)
+        for phase in PHASES:
+            self.assertGreaterEqual(metrics.phase_ns[phase], 0)
+
+    def test_same_results_with_and_without_metrics(self):
+        plain = Simulator(stand_on(17), seed = 8).run(500)
+        timed = Simulator(stand_on(17), seed = 8, metrics = Metrics()).run(500)
+        self.assertEqual(plain.as_dict(), timed.as_dict())
+
+    def test_only_instrumented_hands_are_counted(self):
+        original = Hand.value
+        metrics_a = Metrics()
+        metrics_b = Metrics()
+        sim_a = Simulator(stand_on(17), seed = 1, metrics = metrics_a)
+        sim_b = Simulator(stand_on(17), seed = 1, metrics = metrics_b)
+        sim_a.run(100)
+        sim_b.run(50)
+        counted_a = metrics_a.hand_values
+        self.assertGreater(counted_a, 100)
+
+        Simulator(stand_on(17), seed = 2).run(100)
+        hand = Hand(is_dealer = False)
+        hand.add_card(Card("A", "S"))
+        self.assertEqual(hand.value, 11)
+
+        self.assertIs(Hand.value, original)
+        self.assertEqual(metrics_a.hand_values, counted_a)
+        self.assertGreater(metrics_b.hand_values, 50)
+        self.assertLess(metrics_b.hand_values, counted_a)
+
+    def test_exports(self):
+        metrics = Metrics()
+        Simulator(stand_on(17), seed = 1, metrics = metrics).run(100)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "metrics.json")
+            prom_path = os.path.join(tmp, "metrics.prom")
+            metrics.write_json(json_path)
+            metrics.write_prometheus(prom_path)
+            with open(json_path) as f:
+                self.assertEqual(json.load(f)["rounds"], 100)
+            with open(prom_path) as f:
+                text = f.read()
+        self.assertIn('blackjack_phase_seconds_total{phase="dealer"}', text)
+        self.assertIn("blackjack_cards_dealt_total", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from paired import PairedSimulator, PairedStats
+from simulator import stand_on, always_stand, get_policy
+import unittest
+
+class TestPaired(unittest.TestCase):
+    def test_identical_policies_have_no_difference(self):
+        sim = PairedSimulator(
+            {"a": stand_on(17), "b": stand_on(17)}, seed = 1, num_decks = 2)
+        stats = sim.run(2000)
+        diff = stats.differences["b"]
+        self.assertEqual(diff.mean, 0.0)
+        self.assertEqual(diff.variance, 0.0)
+        self.assertEqual(stats.stats["a"].as_dict(), stats.stats["b"].as_dict())
+
+    def test_dealer_cards_shared(self):
+        # neither policy busts, so both must face the same dealer hand
+        sim = PairedSimulator(
+            {"stand": always_stand, "hit_to_12": stand_on(12)}, seed = 3)
+        for _ in range(2000):
+            stand, hit = sim.play_round()
+            if hit.player_value <= 21:
+                self.assertEqual(stand.dealer_value, hit.dealer_value)
+
+    def test_variance_reduction(self):
+        sim = PairedSimulator(
+            {"stand17": stand_on(17), "basic": get_policy("basic", 6)},
+            seed = 2, num_decks = 6)
+        stats = sim.run(5000)
+        self.assertGreater(stats.variance_reduction("basic"), 2)
+        report = stats.as_dict()
+        self.assertEqual(report["baseline"], "stand17")
+        self.assertIn("basic - stand17", report["differences"])
+
+    def test_merge(self):
+        policies = {"a": stand_on(17), "b": stand_on(13)}
+        stats_1 = PairedSimulator(policies, seed = 1).run(300)
+        stats_2 = PairedSimulator(policies, seed = 2).run(200)
+        merged = PairedStats(["a", "b"]).merge(stats_1).merge(stats_2)
+        self.assertEqual(merged.stats["a"].rounds, 500)
+        self.assertEqual(merged.differences["b"].count, 500)
+
+    def test_needs_a_policy(self):
+        with self.assertRaises(ValueError):
+            PairedSimulator({})
+
+
+if __name__ == "__main__":
+    unittest.main()
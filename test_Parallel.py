@@ -0,0 +1,40 @@
+from parallel import derive_seed, run_parallel
+import unittest
+
+class TestParallel(unittest.TestCase):
+    def test_same_totals_for_any_worker_count(self):
+        kwargs = dict(seed = 11, chunk_rounds = 700, num_decks = 2)
+        one = run_parallel(5000, workers = 1, **kwargs)
+        two = run_parallel(5000, workers = 2, **kwargs)
+        three = run_parallel(5000, workers = 3, **kwargs)
+        self.assertEqual(one.rounds, 5000)
+        self.assertEqual(one.as_dict(), two.as_dict())
+        self.assertEqual(one.as_dict(), three.as_dict())
+
+    def test_counting_bet_spread(self):
+        stats = run_parallel(
+            3000, seed = 2, workers = 1, num_decks = 6, count = "hilo",
+            ramp = {2: 4, 4: 8})
+        self.assertGreater(stats.total_bet, 3000)
+        with self.assertRaises(ValueError):
+            run_parallel(10, workers = 1, count = "card_sharp")
+
+    def test_drawn_seed_is_reported(self):
+        stats = run_parallel(1500, workers = 1, chunk_rounds = 700)
+        self.assertIsInstance(stats.seed, int)
+        again = run_parallel(1500, seed = stats.seed, workers = 1,
+                             chunk_rounds = 700)
+        self.assertEqual(again.as_dict(), stats.as_dict())
+
+    def test_derived_seeds_differ(self):
+        seeds = {derive_seed(1, i) for i in range(100)}
+        self.assertEqual(len(seeds), 100)
+        self.assertNotEqual(derive_seed(1, 0), derive_seed(2, 0))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            run_parallel(10, policy = "card_sharp", workers = 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
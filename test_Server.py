@@ -0,0 +1,70 @@
+from server import TableServer
+from loadtest import run_load
+import asyncio
+import unittest
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = TableServer(port = 0, action_timeout = 0.2, seed = 1)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection(
+            "127.0.0.1", self.server.port)
+        await self.reader.readline()
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        self.server.close()
+        await self.server.server.wait_closed()
+
+    async def send(self, command):
+        self.writer.write(command.encode() + b"\n")
+        await self.writer.drain()
+
+    async def read_until(self, *prefixes):
+        lines = []
+        while True:
+            raw = await asyncio.wait_for(self.reader.readline(), 5)
+            if not raw:
+                raise ConnectionError("server closed the connection")
+            line = raw.decode().strip()
+            lines.append(line)
+            if line.split(" ", 1)[0] in prefixes:
+                return lines
+
+    async def test_round_ends_with_result(self):
+        for _ in range(5):
+            await self.send("deal")
+            lines = await self.read_until("TURN", "RESULT")
+            while lines[-1] == "TURN":
+                await self.send("s")
+                lines = await self.read_until("TURN", "RESULT")
+            outcome = lines[-1].split()[1]
+            self.assertNotEqual(outcome, "bust")
+
+    async def test_action_timeout_stands(self):
+        while True:
+            await self.send("deal")
+            lines = await self.read_until("TURN", "RESULT")
+            if lines[-1] == "TURN":
+                break
+        lines = await self.read_until("RESULT")
+        self.assertEqual(lines[0], "TIMEOUT")
+
+    async def test_unknown_command(self):
+        await self.send("double")
+        lines = await self.read_until("ERR")
+        self.assertIn("double", lines[-1])
+
+    async def test_read_until_fails_when_server_closes(self):
+        await self.send("quit")
+        with self.assertRaises(ConnectionError):
+            await self.read_until("RESULT")
+
+    async def test_load_many_tables(self):
+        summary = await run_load(200, 3)
+        self.assertEqual(summary["errors"], 0)
+        self.assertGreater(summary["requests"], 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from classes import Shoe
+from counting import HI_LO, KO, bet_ramp
+from dealer_probs import composition_from_cards
+import pickle
+import random
+import unittest
+
+class TestShoe(unittest.TestCase):
+    def test_holds_num_decks(self):
+        shoe = Shoe(num_decks = 6)
+        self.assertEqual(len(shoe.cards), 312)
+        self.assertEqual(shoe.remaining, 312)
+        codes = sorted(card.code for card in shoe.cards)
+        self.assertEqual(codes, sorted(list(range(52)) * 6))
+
+    def test_deal_advances_cursor(self):
+        shoe = Shoe(num_decks = 2, rng = random.Random(1))
+        first = shoe.cards[0]
+        self.assertIs(shoe.deal(), first)
+        self.assertEqual(shoe.position, 1)
+        self.assertEqual(len(shoe.cards), 104)
+
+    def test_needs_shuffle_at_cut_card(self):
+        shoe = Shoe(num_decks = 1, penetration = 0.5)
+        for _ in range(25):
+            shoe.deal()
+        self.assertFalse(shoe.needs_shuffle)
+        shoe.deal()
+        self.assertTrue(shoe.needs_shuffle)
+
+    def test_shuffle_reuses_storage(self):
+        shoe = Shoe(num_decks = 2)
+        cards = shoe.cards
+        for _ in range(60):
+            shoe.deal()
+        shoe.shuffle()
+        self.assertIs(shoe.cards, cards)
+        self.assertEqual(shoe.position, 0)
+
+    def test_deal_past_end_reshuffles(self):
+        shoe = Shoe(num_decks = 1, penetration = 1)
+        for _ in range(53):
+            shoe.deal()
+        self.assertEqual(shoe.position, 1)
+
+    def test_invalid_num_decks(self):
+        with self.assertRaises(ValueError):
+            Shoe(num_decks = 9)
+        with self.assertRaises(ValueError):
+            Shoe(num_decks = 0)
+
+    def test_rank_counts_follow_deal(self):
+        shoe = Shoe(num_decks = 2, rng = random.Random(4))
+        for _ in range(37):
+            shoe.deal()
+            self.assertEqual(
+                shoe.composition,
+                composition_from_cards(shoe.cards[shoe.position:]))
+        shoe.shuffle()
+        self.assertEqual(shoe.composition, [8] * 9 + [32])
+
+    def test_hi_lo_running_count(self):
+        shoe = Shoe(num_decks = 1, rng = random.Random(2), count_system = HI_LO)
+        count = 0
+        for _ in range(30):
+            points = shoe.deal().points
+            count += 1 if 2 <= points <= 6 else -1 if points in (1, 10) else 0
+        self.assertEqual(shoe.running_count, count)
+        self.assertAlmostEqual(shoe.true_count, count * 52 / 22)
+
+    def test_balanced_count_ends_at_zero(self):
+        shoe = Shoe(num_decks = 2, penetration = 1, count_system = HI_LO)
+        for _ in range(104):
+            shoe.deal()
+        self.assertEqual(shoe.running_count, 0)
+
+    def test_ko_initial_count(self):
+        shoe = Shoe(num_decks = 6, count_system = KO)
+        self.assertEqual(shoe.running_count, -20)
+        for _ in range(312):
+            shoe.deal()
+        self.assertEqual(shoe.running_count, 4)
+
+    def test_bet_ramp(self):
+        shoe = Shoe(num_decks = 1, count_system = HI_LO)
+        bet_sizer = bet_ramp({2: 4, 4: 8}, min_bet = 1)
+        shoe.running_count = 0
+        self.assertEqual(bet_sizer(shoe), 1)
+        shoe.running_count = 2
+        self.assertEqual(bet_sizer(shoe), 4)
+        shoe.running_count = 5
+        self.assertEqual(bet_sizer(shoe), 8)
+
+    def test_pickle_round_trip(self):
+        for shoe in (Shoe(num_decks = 2), Shoe(rng = random.Random(3))):
+            shoe.deal()
+            copy = pickle.loads(pickle.dumps(shoe))
+            self.assertEqual(copy.cards, shoe.cards)
+            self.assertEqual(copy.position, 1)
+            copy.shuffle()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+from simulator import (
+    Simulator, SimulationStats, get_policy, always_stand, stand_on,
+    BUST, BLACKJACK, DEALER_BLACKJACK, LOSS, WIN, DEALER_BUST)
+from classes import Shoe
+from counting import HI_LO, bet_ramp
+import math
+import os
+import random
+import statistics
+import tempfile
+import unittest
+
+class TestSimulator(unittest.TestCase):
+    def test_same_seed_same_results(self):
+        sim_1 = Simulator(stand_on(17), seed = 7)
+        sim_2 = Simulator(stand_on(17), seed = 7)
+        for _ in range(200):
+            self.assertEqual(sim_1.play_round(), sim_2.play_round())
+
+    def test_always_stand_never_busts(self):
+        stats = Simulator(always_stand, seed = 1).run(2000)
+        self.assertEqual(stats.outcomes[BUST], 0)
+        self.assertEqual(stats.rounds, 2000)
+
+    def test_result_matches_outcome(self):
+        sim = Simulator(stand_on(17), seed = 3)
+        for _ in range(2000):
+            result = sim.play_round()
+            if result.outcome == BUST:
+                self.assertGreater(result.player_value, 21)
+            elif result.outcome == DEALER_BUST:
+                self.assertGreater(result.dealer_value, 21)
+            elif result.outcome == LOSS:
+                self.assertGreaterEqual(result.dealer_value, result.player_value)
+            elif result.outcome == WIN:
+                self.assertGreater(result.player_value, result.dealer_value)
+            elif result.outcome == BLACKJACK:
+                self.assertEqual(result.payout, 1.5)
+            elif result.outcome == DEALER_BLACKJACK:
+                self.assertEqual(result.dealer_value, 21)
+
+    def test_merge_stats(self):
+        stats_1 = Simulator(stand_on(17), seed = 1).run(100)
+        stats_2 = Simulator(stand_on(17), seed = 2).run(50)
+        merged = SimulationStats().merge(stats_1).merge(stats_2)
+        self.assertEqual(merged.rounds, 150)
+        self.assertEqual(sum(merged.outcomes), 150)
+        self.assertEqual(
+            merged.total_payout, stats_1.total_payout + stats_2.total_payout)
+
+    def test_bet_sizer_scales_payout(self):
+        sim = Simulator(stand_on(17), seed = 5, bet_sizer = lambda shoe: 3.0)
+        stats = sim.run(500)
+        flat = Simulator(stand_on(17), seed = 5).run(500)
+        self.assertEqual(stats.total_bet, 1500)
+        self.assertEqual(stats.total_payout, 3 * flat.total_payout)
+
+    def test_streaming_variance(self):
+        sim = Simulator(stand_on(17), seed = 6)
+        stats = SimulationStats()
+        payouts = []
+        for _ in range(3000):
+            result = sim.play_round()
+            stats.add(result)
+            payouts.append(result.payout)
+        self.assertAlmostEqual(stats.mean_payout, statistics.fmean(payouts))
+        self.assertAlmostEqual(stats.variance, statistics.variance(payouts))
+
+    def test_merged_variance(self):
+        stats_1 = Simulator(stand_on(17), seed = 1).run(1000)
+        stats_2 = Simulator(stand_on(15), seed = 2).run(300)
+        sim_1 = Simulator(stand_on(17), seed = 1)
+        sim_2 = Simulator(stand_on(15), seed = 2)
+        payouts = [sim_1.play_round().payout for _ in range(1000)]
+        payouts += [sim_2.play_round().payout for _ in range(300)]
+        merged = SimulationStats().merge(stats_1).merge(stats_2)
+        self.assertAlmostEqual(merged.variance, statistics.variance(payouts))
+
+    def test_run_until_target_width(self):
+        sim = Simulator(stand_on(17), seed = 4)
+        stats = sim.run_until(0.05, min_rounds = 1000, check_every = 500)
+        low, high = stats.house_edge_interval()
+        self.assertLessEqual(high - low, 0.05)
+        self.assertLess(stats.rounds, 20000)
+
+    def test_run_until_max_rounds(self):
+        sim = Simulator(stand_on(17), seed = 4)
+        stats = sim.run_until(0.0, max_rounds = 2500, check_every = 1000)
+        self.assertEqual(stats.rounds, 2500)
+
+    def test_house_edge_per_unit_bet(self):
+        sim = Simulator(
+            stand_on(17), seed = 1, num_decks = 6, count_system = HI_LO,
+            bet_sizer = bet_ramp({1: 10}))
+        stats = sim.run(20000)
+        self.assertGreater(stats.total_bet, stats.rounds)
+        self.assertAlmostEqual(
+            stats.house_edge, -stats.total_payout / stats.total_bet)
+        self.assertNotAlmostEqual(stats.house_edge, -stats.mean_payout, places = 2)
+        low, high = stats.house_edge_interval()
+        self.assertLess(low, stats.house_edge)
+        self.assertGreater(high, stats.house_edge)
+
+    def test_house_edge_std_error_matches_batches(self):
+        # the delta-method error should agree with the spread of the edge
+        # over independent runs
+        bet_sizer = bet_ramp({1: 4, 3: 8})
+        edges = []
+        for seed in range(40):
+            stats = Simulator(
+                stand_on(17), seed = seed, num_decks = 2, count_system = HI_LO,
+                bet_sizer = bet_sizer).run(2000)
+            edges.append(stats.house_edge)
+        merged = SimulationStats()
+        for seed in range(40):
+            merged.merge(Simulator(
+                stand_on(17), seed = seed, num_decks = 2, count_system = HI_LO,
+                bet_sizer = bet_sizer).run(2000))
+        expected = statistics.stdev(edges) / math.sqrt(len(edges))
+        self.assertAlmostEqual(
+            merged.house_edge_std_error / expected, 1.0, delta = 0.35)
+
+    def test_flat_bet_edge_matches_payout(self):
+        stats = Simulator(stand_on(17), seed = 3).run(3000)
+        self.assertAlmostEqual(stats.house_edge, -stats.mean_payout)
+        self.assertAlmostEqual(stats.house_edge_std_error, stats.std_error)
+
+    def test_checkpoint_resume_is_exact(self):
+        uninterrupted = Simulator(stand_on(17), seed = 9, num_decks = 2).run(3000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.ckpt")
+            first = Simulator(stand_on(17), seed = 9, num_decks = 2)
+            first.run_until(0.0, max_rounds = 1200, check_every = 1200,
+                            checkpoint = path)
+            second = Simulator(stand_on(17), seed = 123, num_decks = 2)
+            stats = second.load_checkpoint(path)
+            second.run(1800, stats)
+        self.assertEqual(stats.as_dict(), uninterrupted.as_dict())
+
+    def test_shoe_state_round_trip(self):
+        shoe = Shoe(num_decks = 2, rng = random.Random(1))
+        for _ in range(40):
+            shoe.deal()
+        other = Shoe(num_decks = 2)
+        other.set_state(shoe.get_state())
+        self.assertEqual([shoe.deal() for _ in range(50)],
+                         [other.deal() for _ in range(50)])
+        with self.assertRaises(ValueError):
+            Shoe(num_decks = 3).set_state(shoe.get_state())
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            get_policy("card_sharp")
+
+
+if __name__ == "__main__":
+    unittest.main()
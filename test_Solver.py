@@ -0,0 +1,49 @@
+from solver import solve, basic_table, save_table, load_table
+from dealer_probs import dealer_probabilities, full_composition
+from simulator import Simulator, get_policy
+import os
+import tempfile
+import unittest
+
+class TestSolver(unittest.TestCase):
+    def test_obvious_decisions(self):
+        table = basic_table(6)
+        for upcard in range(1, 11):
+            for value in range(4, 12):
+                self.assertEqual(table[0][value][upcard], 'h')
+            for value in range(19, 22):
+                self.assertEqual(table[0][value][upcard], 's')
+                self.assertEqual(table[1][value][upcard], 's')
+
+    def test_stand_on_21_ev(self):
+        composition = full_composition(1)
+        composition[9] -= 1
+        dealer = dealer_probabilities(10, composition)
+        p_21 = dealer[21] / (1 - dealer["blackjack"])
+        self.assertAlmostEqual(solve(1).stand_ev[0][21][10], 1 - 2 * p_21)
+
+    def test_hit_ev_matches_table(self):
+        solution = solve(2)
+        for soft in (0, 1):
+            for value in range(12, 22):
+                for upcard in range(1, 11):
+                    hit = solution.hit_ev[soft][value][upcard]
+                    stand = solution.stand_ev[soft][value][upcard]
+                    expected = 's' if stand >= hit else 'h'
+                    self.assertEqual(solution.table[soft][value][upcard], expected)
+
+    def test_save_and_load(self):
+        table = basic_table(4)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.json")
+            save_table(table, path)
+            self.assertEqual(load_table(path), table)
+
+    def test_basic_beats_mimic_dealer(self):
+        basic = Simulator(get_policy("basic", 6), seed = 2, num_decks = 6).run(20000)
+        mimic = Simulator(get_policy("stand17"), seed = 2, num_decks = 6).run(20000)
+        self.assertGreater(basic.mean_payout, mimic.mean_payout)
+
+
+if __name__ == "__main__":
+    unittest.main()